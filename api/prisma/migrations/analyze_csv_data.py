@@ -2,13 +2,358 @@
 """
 CSV Property Data Analyzer
 Extracts unique dropdown values from property CSV files
+
+Runs in a single streaming pass: memory grows with the number of distinct
+values, not rows, and any distinct set larger than --distinct-threshold
+switches to a HyperLogLog estimate.
+
+Files (or byte ranges of large files, see --chunk-bytes) are analyzed
+independently, optionally in a process pool (--workers), and the partial
+summaries are merged in file order. In exact mode the merged result is
+identical to a serial run.
+
+Per-file summaries are cached in .analysis_cache/ and reused while a
+file's size and mtime, or failing that its content hash, are unchanged,
+so only new or modified exports are re-scanned (--no-cache to disable).
+
+Each property_data_N.csv may instead be supplied as a .gz, .bz2 or .xz
+export. It is decompressed while it is read; since a compressed stream
+cannot be entered at an arbitrary byte, it is analyzed as a single task.
 """
+import argparse
 import csv
+import hashlib
 import json
-from collections import defaultdict
+import math
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from csv_sources import DEFAULT_READ_BUFFER, CsvSource, ProgressReporter, parse_size, resolve_csv_path
+
+# Distinct values kept exactly per counter before switching to HyperLogLog
+DEFAULT_DISTINCT_THRESHOLD = 100000
+HLL_PRECISION = 14  # 16384 registers, ~0.8% standard error
+
+# Parallel analysis
+DEFAULT_WORKERS = 1  # 1 = analyze in this process
+DEFAULT_CHUNK_BYTES = 0  # 0 = one task per file
+
+# Per-file result cache
+DEFAULT_CACHE_DIR = '.analysis_cache'
+CACHE_VERSION = 1  # Bump when the summary layout or extraction rules change
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Fields that should be extracted as dropdown values
+DROPDOWN_FIELDS = {
+    'Type': 'property_types',
+    'Unit For': 'property_statuses',
+    'Finished': 'finishing_statuses',
+    'Area': 'regions',
+    'The Floors': 'floor_levels',
+    'STATUS': 'property_categories',
+    'داخل كمبوند / خارج كمبوند': 'compound_status',
+    'COMPOUND': 'compound_status_alt',
+    'Phase': 'development_phases'
+}
+
+class HyperLogLog:
+    """Approximate distinct counter"""
+    
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+    
+    def add(self, value):
+        x = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = x >> (64 - self.precision)
+        remaining = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        
+        # Small-range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class DistinctCounter:
+    """Exact distinct set that degrades to HyperLogLog above a threshold"""
+    
+    def __init__(self, threshold=DEFAULT_DISTINCT_THRESHOLD):
+        self.threshold = threshold
+        self.values = set()
+        self.sketch = None
+    
+    @property
+    def exact(self):
+        return self.sketch is None
+    
+    def add(self, value):
+        if self.sketch is not None:
+            self.sketch.add(value)
+            return
+        
+        self.values.add(value)
+        if len(self.values) > self.threshold:
+            self._to_sketch()
+    
+    def _to_sketch(self):
+        self.sketch = HyperLogLog()
+        for v in self.values:
+            self.sketch.add(v)
+        self.values = None
+    
+    def merge(self, other):
+        """Fold in a counter built elsewhere (e.g. by a worker process)"""
+        if self.sketch is None and other.sketch is None:
+            self.values |= other.values
+            if len(self.values) > self.threshold:
+                self._to_sketch()
+            return
+        
+        if self.sketch is None:
+            self._to_sketch()
+        if other.sketch is None:
+            for v in other.values:
+                self.sketch.add(v)
+        else:
+            self.sketch.registers = bytearray(map(max, self.sketch.registers, other.sketch.registers))
+    
+    def __len__(self):
+        return len(self.values) if self.sketch is None else self.sketch.count()
+    
+    def to_json(self):
+        if self.sketch is None:
+            return {'values': sorted(self.values)}
+        return {'registers': self.sketch.registers.hex()}
+    
+    @classmethod
+    def from_json(cls, data, threshold):
+        counter = cls(threshold)
+        if 'registers' in data:
+            counter.sketch = HyperLogLog()
+            counter.sketch.registers = bytearray.fromhex(data['registers'])
+            counter.values = None
+        else:
+            counter.values = set(data['values'])
+        return counter
+
+def is_filled(value):
+    """A cell counts as filled unless it is blank or the '????' placeholder"""
+    return bool(value) and value.strip() not in ('', '????')
+
+def decode_line(line):
+    """Decode a raw line the way text mode would (utf-8, universal newlines)"""
+    return line.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+def read_header(f):
+    """Read the header record of a CSV opened in binary mode"""
+    lines = []
+    quotes = 0
+    for line in iter(f.readline, b''):
+        lines.append(decode_line(line))
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            break
+    return next(csv.reader(lines), [])
+
+def plan_file_tasks(filepath, chunk_bytes=DEFAULT_CHUNK_BYTES, read_buffer=DEFAULT_READ_BUFFER):
+    """Split a file into byte ranges that start and end on record boundaries
+    
+    A newline only ends a record when the number of quotes before it is
+    even (escaped quotes come in pairs), so ranges never split a quoted
+    multi-line field. Compressed files get one range running to the end
+    of the stream (end None).
+    """
+    size = filepath.stat().st_size
+    with CsvSource(filepath, read_buffer) as source:
+        f = source.stream
+        fieldnames = read_header(f)
+        pos = f.tell()
+        ranges = []
+        if source.compressed:
+            return fieldnames, [(pos, None)]
+        
+        while chunk_bytes and pos + chunk_bytes < size:
+            start = pos
+            block = f.read(chunk_bytes)
+            pos += len(block)
+            parity = block.count(b'"') % 2
+            
+            # Finish the current line, and keep going while inside quotes
+            for line in iter(f.readline, b''):
+                pos += len(line)
+                parity = (parity + line.count(b'"')) % 2
+                if parity == 0:
+                    break
+            ranges.append((start, pos))
+        
+        if pos < size:
+            ranges.append((pos, size))
+    
+    return fieldnames, ranges
+
+def new_summary(distinct_threshold):
+    """Empty summary of a file or byte range"""
+    return {
+        'row_count': 0,
+        'numbered_rows': 0,
+        'property_numbers': DistinctCounter(distinct_threshold),
+        'unique_values': defaultdict(lambda: DistinctCounter(distinct_threshold)),
+        'column_rows': Counter(),
+        'column_filled': Counter(),
+        'error': None
+    }
+
+def merge_summary(target, summary):
+    """Fold a chunk summary into a file summary"""
+    target['row_count'] += summary['row_count']
+    target['numbered_rows'] += summary['numbered_rows']
+    target['property_numbers'].merge(summary['property_numbers'])
+    for table_name, counter in summary['unique_values'].items():
+        target['unique_values'][table_name].merge(counter)
+    target['column_rows'].update(summary['column_rows'])
+    target['column_filled'].update(summary['column_filled'])
+    target['error'] = summary['error']
+
+def file_content_hash(filepath):
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+class AnalysisCache:
+    """Per-file summaries keyed by file size, mtime and content hash"""
+    
+    def __init__(self, cache_dir, distinct_threshold):
+        self.cache_dir = Path(cache_dir)
+        self.distinct_threshold = distinct_threshold
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, filepath):
+        return self.cache_dir / f"{filepath.name}.json"
+    
+    def lookup(self, filepath):
+        """Return (fieldnames, summary) for an unchanged file, or None"""
+        entry_path = self._entry_path(filepath)
+        stat = filepath.stat()
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        
+        if entry is None or entry.get('version') != CACHE_VERSION \
+                or entry.get('distinct_threshold') != self.distinct_threshold \
+                or entry['size'] != stat.st_size:
+            self.misses += 1
+            return None
+        
+        if entry['mtime_ns'] != stat.st_mtime_ns:
+            # Touched or re-copied: only trust the entry if the content is the same
+            if entry['content_hash'] != file_content_hash(filepath):
+                self.misses += 1
+                return None
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._write(entry_path, entry)
+        
+        self.hits += 1
+        data = entry['summary']
+        summary = new_summary(self.distinct_threshold)
+        summary['row_count'] = data['row_count']
+        summary['numbered_rows'] = data['numbered_rows']
+        summary['property_numbers'] = DistinctCounter.from_json(data['property_numbers'], self.distinct_threshold)
+        for table_name, counter in data['unique_values'].items():
+            summary['unique_values'][table_name] = DistinctCounter.from_json(counter, self.distinct_threshold)
+        summary['column_rows'] = Counter(data['column_rows'])
+        summary['column_filled'] = Counter(data['column_filled'])
+        return entry['fieldnames'], summary
+    
+    def store(self, filepath, fieldnames, summary):
+        stat = filepath.stat()
+        entry = {
+            'version': CACHE_VERSION,
+            'distinct_threshold': self.distinct_threshold,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'content_hash': file_content_hash(filepath),
+            'fieldnames': fieldnames,
+            'summary': {
+                'row_count': summary['row_count'],
+                'numbered_rows': summary['numbered_rows'],
+                'property_numbers': summary['property_numbers'].to_json(),
+                # Keep first-seen table order so merged output matches an uncached run
+                'unique_values': {k: v.to_json() for k, v in summary['unique_values'].items()},
+                'column_rows': dict(summary['column_rows']),
+                'column_filled': dict(summary['column_filled'])
+            }
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._write(self._entry_path(filepath), entry)
+    
+    def _write(self, entry_path, entry):
+        tmp_path = entry_path.with_name(entry_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        tmp_path.replace(entry_path)
 
-def analyze_csv_files():
+def analyze_chunk(task):
+    """Summarize one byte range of a CSV file (runs in a worker process)"""
+    filepath, fieldnames, start, end, distinct_threshold, read_buffer = task
+    summary = new_summary(distinct_threshold)
+    
+    def lines(f):
+        f.seek(start)
+        pos = start
+        while end is None or pos < end:
+            line = f.readline()
+            if not line:
+                return
+            pos += len(line)
+            yield decode_line(line)
+    
+    try:
+        with CsvSource(filepath, read_buffer) as source:
+            progress = ProgressReporter(source) if end is None else None
+            for row in csv.DictReader(lines(source.stream), fieldnames=fieldnames):
+                summary['row_count'] += 1
+                if progress:
+                    progress.maybe_report(summary['row_count'])
+                
+                # Track property number for duplicate detection
+                prop_number = row.get('Property Number', '')
+                if prop_number:
+                    summary['numbered_rows'] += 1
+                    summary['property_numbers'].add(prop_number)
+                
+                # Extract dropdown values
+                for field_name, table_name in DROPDOWN_FIELDS.items():
+                    value = (row.get(field_name) or '').strip()
+                    if value and value != '????':
+                        summary['unique_values'][table_name].add(value)
+                
+                # Fill rates
+                for column in fieldnames:
+                    summary['column_rows'][column] += 1
+                    if is_filled(row.get(column)):
+                        summary['column_filled'][column] += 1
+    except Exception as e:
+        summary['error'] = str(e)
+    
+    summary['unique_values'] = dict(summary['unique_values'])
+    return summary
+
+def analyze_csv_files(distinct_threshold=DEFAULT_DISTINCT_THRESHOLD, workers=DEFAULT_WORKERS,
+                      chunk_bytes=DEFAULT_CHUNK_BYTES, use_cache=True, cache_dir=None,
+                      read_buffer=DEFAULT_READ_BUFFER):
     """Analyze all CSV files and extract unique values for dropdown fields"""
     
     csv_files = [
@@ -17,104 +362,155 @@ def analyze_csv_files():
         'property_data_3.csv'
     ]
     
-    # Fields that should be extracted as dropdown values
-    dropdown_fields = {
-        'Type': 'property_types',
-        'Unit For': 'property_statuses',
-        'Finished': 'finishing_statuses',
-        'Area': 'regions',
-        'The Floors': 'floor_levels',
-        'STATUS': 'property_categories',
-        'داخل كمبوند / خارج كمبوند': 'compound_status',
-        'COMPOUND': 'compound_status_alt',
-        'Phase': 'development_phases'
-    }
-    
     # Store unique values for each field
-    unique_values = defaultdict(set)
+    unique_values = defaultdict(lambda: DistinctCounter(distinct_threshold))
     
-    # Track all properties (for duplicate detection)
-    all_properties = []
-    property_numbers_seen = set()
+    # Property numbers seen so far (for duplicate detection)
+    property_numbers_seen = DistinctCounter(distinct_threshold)
+    total_duplicates = 0
+    
+    # Per-column fill counts across all files
+    column_rows = Counter()
+    column_filled = Counter()
     
     # Store column names from each file
     file_columns = {}
     
+    cache = None
+    if use_cache:
+        cache = AnalysisCache(cache_dir or Path(__file__).parent / DEFAULT_CACHE_DIR, distinct_threshold)
+    
+    # Plan every changed file's byte ranges up front so workers can start on all of them
+    plans = []
+    tasks = []
     for csv_file in csv_files:
-        filepath = Path(__file__).parent / csv_file
+        filepath = resolve_csv_path(Path(__file__).parent, csv_file)
         
         if not filepath.exists():
-            print(f"⚠️  File not found: {csv_file}")
+            plans.append((csv_file, filepath, None, 0, 'missing'))
+            continue
+        
+        cached = cache.lookup(filepath) if cache else None
+        if cached:
+            plans.append((csv_file, filepath, cached[0], cached[1], None))
             continue
-            
-        print(f"\n📄 Analyzing {csv_file}...")
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # Store column names
-                file_columns[csv_file] = reader.fieldnames
-                print(f"   Columns found: {len(reader.fieldnames)}")
-                
-                row_count = 0
-                duplicate_count = 0
-                
-                for row in reader:
-                    row_count += 1
-                    
-                    # Track property number for duplicate detection
-                    prop_number = row.get('Property Number', '')
-                    if prop_number:
-                        if prop_number in property_numbers_seen:
-                            duplicate_count += 1
-                        else:
-                            property_numbers_seen.add(prop_number)
-                            all_properties.append({
-                                'file': csv_file,
-                                'property_number': prop_number,
-                                'row': row
-                            })
-                    
-                    # Extract dropdown values
-                    for field_name, table_name in dropdown_fields.items():
-                        value = row.get(field_name, '').strip()
-                        if value and value != '????' and value != '':
-                            unique_values[table_name].add(value)
-                
-                print(f"   ✅ Processed {row_count} rows ({duplicate_count} duplicates detected)")
-                
+            fieldnames, ranges = plan_file_tasks(filepath, chunk_bytes, read_buffer)
         except Exception as e:
-            print(f"   ❌ Error reading {csv_file}: {e}")
+            plans.append((csv_file, filepath, None, 0, str(e)))
+            continue
+        
+        plans.append((csv_file, filepath, fieldnames, len(ranges), None))
+        tasks.extend((str(filepath), fieldnames, start, end, distinct_threshold, read_buffer) for start, end in ranges)
+    
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = iter(list(executor.map(analyze_chunk, tasks)))
+    else:
+        summaries = map(analyze_chunk, tasks)
+    
+    # Merge partial summaries in file order, exactly as a serial pass would
+    for csv_file, filepath, fieldnames, chunks, error in plans:
+        if error == 'missing':
+            print(f"⚠️  File not found: {csv_file}")
+            continue
+        
+        print(f"\n📄 Analyzing {csv_file}...")
+        
+        if error:
+            print(f"   ❌ Error reading {csv_file}: {error}")
+            continue
+        
+        # Store column names
+        file_columns[csv_file] = fieldnames
+        print(f"   Columns found: {len(fieldnames)}")
+        
+        if isinstance(chunks, dict):
+            file_summary = chunks
+            print(f"   ♻️  Unchanged since last run, using cached analysis")
+        else:
+            file_summary = new_summary(distinct_threshold)
+            for _ in range(chunks):
+                summary = next(summaries)
+                if not file_summary['error']:
+                    merge_summary(file_summary, summary)
+            if cache and not file_summary['error']:
+                cache.store(filepath, fieldnames, file_summary)
+        
+        # A failed file still contributes the rows read before the error
+        distinct_before = len(property_numbers_seen)
+        property_numbers_seen.merge(file_summary['property_numbers'])
+        for table_name, counter in file_summary['unique_values'].items():
+            unique_values[table_name].merge(counter)
+        column_rows.update(file_summary['column_rows'])
+        column_filled.update(file_summary['column_filled'])
+        
+        if file_summary['error']:
+            print(f"   ❌ Error reading {csv_file}: {file_summary['error']}")
+            continue
+        
+        # Rows whose property number was already seen (estimated once approximate)
+        duplicate_count = file_summary['numbered_rows'] - (len(property_numbers_seen) - distinct_before)
+        total_duplicates += duplicate_count
+        print(f"   ✅ Processed {file_summary['row_count']} rows ({duplicate_count} duplicates detected)")
+    
+    approximate = not property_numbers_seen.exact or any(not c.exact for c in unique_values.values())
     
     # Print summary
     print("\n" + "="*60)
     print("📊 DROPDOWN VALUES SUMMARY")
     print("="*60)
     
-    for table_name, values in sorted(unique_values.items()):
-        print(f"\n{table_name.upper()}: {len(values)} unique values")
-        for value in sorted(values):
+    for table_name, counter in sorted(unique_values.items()):
+        if not counter.exact:
+            print(f"\n{table_name.upper()}: ~{len(counter)} unique values (approximate, not listed)")
+            continue
+        print(f"\n{table_name.upper()}: {len(counter)} unique values")
+        for value in sorted(counter.values):
             print(f"  • {value}")
     
+    fill_rates = {
+        column: round(column_filled[column] / column_rows[column], 4)
+        for column in column_rows
+    }
+    
+    print("\n" + "="*60)
+    print("📋 COLUMN FILL RATES")
+    print("="*60)
+    for column, rate in sorted(fill_rates.items(), key=lambda item: -item[1]):
+        print(f"  {rate:7.1%}  {column}")
+    
     print("\n" + "="*60)
     print(f"📈 TOTAL STATISTICS")
     print("="*60)
-    print(f"Unique properties: {len(all_properties)}")
+    print(f"Unique properties: {len(property_numbers_seen)}")
     print(f"Total property numbers: {len(property_numbers_seen)}")
-    print(f"Duplicates detected: {sum(1 for p in all_properties if all_properties.count(p) > 1)}")
+    print(f"Duplicates detected: {total_duplicates}")
+    if approximate:
+        print(f"⚠️  Counts above {distinct_threshold} distinct values are HyperLogLog estimates")
+    if cache:
+        print(f"Analysis cache: {cache.hits} hits, {cache.misses} misses")
     
     # Save analysis to JSON
     output = {
-        'dropdown_values': {k: sorted(list(v)) for k, v in unique_values.items()},
+        'dropdown_values': {k: sorted(v.values) for k, v in unique_values.items() if v.exact},
         'statistics': {
-            'unique_properties': len(all_properties),
+            'unique_properties': len(property_numbers_seen),
             'total_property_numbers': len(property_numbers_seen),
-            'files_analyzed': len(csv_files)
+            'files_analyzed': len(csv_files),
+            'duplicates_detected': total_duplicates,
+            'approximate': approximate
         },
-        'file_columns': file_columns
+        'file_columns': file_columns,
+        'fill_rates': fill_rates
     }
     
+    if approximate:
+        output['approximate_distinct_counts'] = {
+            k: len(v) for k, v in unique_values.items() if not v.exact
+        }
+    
     output_path = Path(__file__).parent / 'csv_analysis.json'
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
@@ -124,4 +520,26 @@ def analyze_csv_files():
     return output
 
 if __name__ == '__main__':
-    analyze_csv_files()
+    parser = argparse.ArgumentParser(description='Analyze property CSV exports')
+    parser.add_argument('--distinct-threshold', type=int, default=DEFAULT_DISTINCT_THRESHOLD,
+                        help='distinct values kept exactly before switching to HyperLogLog')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='processes used to analyze files or chunks (1 = no pool)')
+    parser.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES,
+                        help='split files into byte ranges of about this size (0 = whole files)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-scan every file and leave the analysis cache untouched')
+    parser.add_argument('--cache-dir', default=None,
+                        help=f'per-file analysis cache directory (default: {DEFAULT_CACHE_DIR} next to this script)')
+    parser.add_argument('--read-buffer', type=parse_size, default=DEFAULT_READ_BUFFER,
+                        help='read buffer for the CSV files and their decompressed stream, e.g. 256k, 4M')
+    args = parser.parse_args()
+    
+    analyze_csv_files(
+        distinct_threshold=args.distinct_threshold,
+        workers=args.workers,
+        chunk_bytes=args.chunk_bytes,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        read_buffer=args.read_buffer
+    )
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Primary Key Benchmark
+Insert throughput and index size with UUID() vs client-side UUIDv7 ids
+
+The same synthetic rows are inserted once per ID strategy into a fresh
+copy of the properties table, in importer-sized batches with a commit per
+batch. With --database the copies are created with CREATE TABLE ... LIKE
+properties in the configured (scratch) database and sized from
+mysql.innodb_index_stats after ANALYZE TABLE; otherwise a SQLite WITHOUT
+ROWID table stands in for the clustered index, with the v1 UUID text
+layout MariaDB's UUID() returns.
+
+UUID() text starts with the low 32 bits of its 100ns clock, which only
+wrap every ~7 minutes, so ids from one quick burst are already almost
+ascending. The scatter shows up for rows written over a longer period
+(incremental runs, the app's own inserts), so the SQLite stand-in
+generates UUID() values as if spread over --uuid-span seconds.
+
+Usage: python3 benchmark_ids.py [--rows 100k] [--database] [--output FILE]
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import import_properties as importer
+from benchmark_import import DEFAULT_DATA_DIR, git_revision, synthetic_mappings
+from generate_property_csv import DEFAULT_SEED, generate_csv, parse_row_count
+from property_ids import ID_STRATEGIES, id_generator
+
+DEFAULT_ROWS = '100k'
+DEFAULT_OUTPUT = 'benchmark_results_ids.json'
+BENCH_TABLE_PREFIX = 'bench_ids_'
+MIB = 1024 * 1024
+DEFAULT_UUID_SPAN = 3600  # Seconds of simulated UUID() clock over the whole run
+UUID_EPOCH_OFFSET = 0x01B21DD213814000  # 100ns ticks from 1582-10-15 to 1970-01-01
+
+def simulated_uuid1(row_count, span_seconds):
+    """UUID() text values as if generated evenly over span_seconds"""
+    ticks = time.time_ns() // 100 + UUID_EPOCH_OFFSET
+    step = max(int(span_seconds * 10000000 / max(row_count, 1)), 1)
+    clock_seq = uuid.uuid1().clock_seq
+    node = uuid.getnode()
+    
+    def new_id():
+        nonlocal ticks
+        ticks += step
+        return str(uuid.UUID(fields=(
+            ticks & 0xFFFFFFFF, (ticks >> 32) & 0xFFFF, ((ticks >> 48) & 0x0FFF) | 0x1000,
+            0x80 | (clock_seq >> 8), clock_seq & 0xFF, node
+        )))
+    return new_id
+
+def load_rows(csv_path):
+    """Insert parameters for every distinct property in a synthetic CSV"""
+    lookups = importer.PropertyLookups(synthetic_mappings())
+    stats = {'processed': 0, 'skipped': 0}
+    with open(csv_path, 'rb') as f:
+        rows = importer.iter_new_properties(importer.iter_csv_rows(f), csv_path.name, set(), stats)
+        return [
+            tuple(importer.build_property_data(row, prop_number, lookups)[col] for col in importer.INSERT_COLUMNS)
+            for row, prop_number, _ in rows
+        ]
+
+class SQLiteTarget:
+    """WITHOUT ROWID table, so rows live in the primary key B-tree like InnoDB"""
+    
+    def __init__(self, path, strategy, row_count, uuid_span=DEFAULT_UUID_SPAN):
+        path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.new_id = id_generator(strategy) or simulated_uuid1(row_count, uuid_span)
+        columns = ', '.join(importer.INSERT_COLUMNS)
+        self.conn.execute(
+            f"CREATE TABLE properties (id TEXT PRIMARY KEY, {columns}, UNIQUE (property_number)) WITHOUT ROWID"
+        )
+        self.sql = (f"INSERT INTO properties ({columns}, id) "
+                    f"VALUES ({', '.join(['?'] * (len(importer.INSERT_COLUMNS) + 1))})")
+    
+    def insert(self, batch):
+        self.conn.executemany(self.sql, [params + (self.new_id(),) for params in batch])
+        self.conn.commit()
+    
+    def sizes(self):
+        """Bytes per B-tree (dbstat) or for the whole file"""
+        try:
+            rows = self.conn.execute(
+                "SELECT name, SUM(pgsize), SUM(pagetype = 'leaf') FROM dbstat GROUP BY name"
+            ).fetchall()
+        except sqlite3.OperationalError:  # SQLite built without dbstat
+            page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+            return {'total': {'bytes': page_count * page_size, 'leaf_pages': None}}
+        names = {'properties': 'PRIMARY', 'sqlite_autoindex_properties_2': 'property_number'}
+        return {names.get(name, name): {'bytes': size, 'leaf_pages': leaves}
+                for name, size, leaves in rows if not name.startswith('sqlite_schema')}
+    
+    def close(self):
+        self.conn.close()
+
+class DatabaseTarget:
+    """Scratch copy of properties in the configured database, dropped afterwards"""
+    
+    def __init__(self, strategy):
+        from db_pool import bulk_session, get_connection
+        self.conn = get_connection()
+        self.cursor = self.conn.cursor()
+        self.table = f"{BENCH_TABLE_PREFIX}{strategy}"
+        self.new_id = id_generator(strategy)
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+        self.cursor.execute(f"CREATE TABLE {self.table} LIKE properties")
+        self.session = bulk_session(self.conn, foreign_key_checks=False)
+        self.session.__enter__()
+    
+    def insert(self, batch):
+        if self.new_id:
+            batch = [params + (self.new_id(),) for params in batch]
+        sql = importer.build_insert_sql(len(batch), client_ids=bool(self.new_id), table=self.table)
+        self.cursor.execute(sql, [v for params in batch for v in params])
+        self.conn.commit()
+    
+    def sizes(self):
+        """Bytes and leaf pages per index from InnoDB's persistent statistics"""
+        self.cursor.execute(f"ANALYZE TABLE {self.table}")
+        self.cursor.fetchall()
+        self.cursor.execute("""
+            SELECT index_name, stat_name, stat_value * @@innodb_page_size, stat_value
+            FROM mysql.innodb_index_stats
+            WHERE database_name = DATABASE() AND table_name = %s AND stat_name IN ('size', 'n_leaf_pages')
+        """, (self.table,))
+        sizes = {}
+        for index_name, stat_name, size_bytes, pages in self.cursor.fetchall():
+            entry = sizes.setdefault(index_name, {'bytes': None, 'leaf_pages': None})
+            if stat_name == 'size':
+                entry['bytes'] = int(size_bytes)
+            else:
+                entry['leaf_pages'] = int(pages)
+        return sizes
+    
+    def close(self):
+        self.session.__exit__(None, None, None)
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+        self.cursor.close()
+        self.conn.close()
+
+def benchmark_strategy(rows, target, batch_size=importer.DEFAULT_BATCH_SIZE):
+    """Insert rows in batches; returns throughput and index sizes"""
+    started = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        target.insert(rows[i:i + batch_size])
+    seconds = time.perf_counter() - started
+    sizes = target.sizes()
+    target.close()
+    return {
+        'rows': len(rows),
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(len(rows) / seconds) if seconds else None,
+        'indexes': sizes
+    }
+
+def run_benchmark(row_count, use_database=False, seed=DEFAULT_SEED, data_dir=None, uuid_span=DEFAULT_UUID_SPAN):
+    data_dir = Path(data_dir or Path(__file__).parent / DEFAULT_DATA_DIR)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = data_dir / f"synthetic_{row_count}_{seed}.csv"
+    if not csv_path.exists():
+        print(f"📝 Generating {row_count} rows...")
+        generate_csv(csv_path, row_count, seed=seed)
+    
+    print(f"Transforming {csv_path.name}...")
+    rows = load_rows(csv_path)
+    
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'insert_target': 'database' if use_database else 'sqlite',
+        'uuid_span': None if use_database else uuid_span,
+        'strategies': {}
+    }
+    
+    for strategy in ID_STRATEGIES:
+        if use_database:
+            target = DatabaseTarget(strategy)
+        else:
+            target = SQLiteTarget(data_dir / f"benchmark_ids_{strategy}.sqlite3", strategy, len(rows), uuid_span)
+        
+        print(f"\n⏱️  {strategy}: inserting {len(rows)} rows...")
+        result = benchmark_strategy(rows, target)
+        report['strategies'][strategy] = result
+        
+        print(f"  {result['rows_per_sec'] or 0:,} rows/sec ({result['seconds']:.2f}s)")
+        for index_name, size in sorted(result['indexes'].items()):
+            leaf_pages = size['leaf_pages'] if size['leaf_pages'] is not None else '-'
+            size_mib = f"{size['bytes'] / MIB:8.2f} MiB" if size['bytes'] is not None else '-'
+            print(f"  {index_name:20s} {size_mib}  leaf pages: {leaf_pages}")
+    
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark UUID() against client-side UUIDv7 primary keys')
+    parser.add_argument('--rows', type=parse_row_count, default=parse_row_count(DEFAULT_ROWS),
+                        help='synthetic rows to insert, e.g. 100k, 1M')
+    parser.add_argument('--database', action='store_true',
+                        help='insert into scratch tables in the configured database instead of SQLite')
+    parser.add_argument('--uuid-span', type=float, default=DEFAULT_UUID_SPAN,
+                        help='seconds the simulated UUID() values are spread over (SQLite stand-in only)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--data-dir', default=None, help=f'where synthetic CSVs are cached (default: {DEFAULT_DATA_DIR})')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='results JSON file')
+    args = parser.parse_args()
+    
+    report = run_benchmark(args.rows, use_database=args.database, seed=args.seed, data_dir=args.data_dir,
+                           uuid_span=args.uuid_span)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to: {args.output}")
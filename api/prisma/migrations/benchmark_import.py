@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Property Import Benchmark
+Measures importer throughput per stage on synthetic exports
+
+Stages (rows/sec each):
+  read       CSV decoding and duplicate filtering
+  parse      parse_price / detect_currency / parse_rooms / date parsing
+  columnar   the same numeric fields through columnar_parse
+  map        Type / Unit For / Finished / Area lookup resolution
+  transform  build_property_data() for whole rows
+  insert     batched inserts into a SQLite stand-in, or into MariaDB/MySQL
+             with --database (point DATABASE_URL at a scratch database)
+
+Rows are read in chunks and each stage is timed on its own, so the numbers
+are comparable between runs; results are written as JSON and --compare
+prints the change against an earlier results file.
+
+Usage: python3 benchmark_import.py [--sizes 10k,100k,1M] [--database] [--compare OLD.json]
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+import import_properties as importer
+from columnar_parse import np, parse_numeric_columns
+from generate_property_csv import DEFAULT_PREFIX, DEFAULT_SEED, REGIONS, generate_csv, parse_row_count
+
+DEFAULT_SIZES = '10k,100k'
+DEFAULT_DATA_DIR = '.benchmark_data'
+DEFAULT_OUTPUT = 'benchmark_results.json'
+BENCHMARK_CHUNK_ROWS = 10000
+STAGES = ('read', 'parse', 'columnar', 'map', 'transform', 'insert')
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+
+def synthetic_mappings():
+    """Lookup IDs for every mapped code, standing in for load_lookup_mappings()"""
+    def ids(prefix, codes):
+        return {code: f"{prefix}-{i}" for i, code in enumerate(sorted(set(codes)))}
+    
+    return {
+        'categories': {},
+        'types': ids('type', importer.TYPE_MAPPING.values()),
+        'statuses': ids('status', importer.STATUS_MAPPING.values()),
+        'finishing': ids('finishing', importer.FINISHING_MAPPING.values()),
+        # Leave a few regions unmapped, like a tenant that has not seeded them yet
+        'regions': ids('region', REGIONS[:-3]),
+        'currencies': {'EGP': 'currency-egp', 'USD': 'currency-usd'}
+    }
+
+class StageTimer:
+    """Accumulated seconds and row counts per stage"""
+    
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.rows = dict.fromkeys(STAGES, 0)
+    
+    def run(self, stage, rows, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.seconds[stage] += time.perf_counter() - started
+        self.rows[stage] += rows
+        return result
+    
+    def results(self):
+        return {
+            stage: {
+                'rows': self.rows[stage],
+                'seconds': round(self.seconds[stage], 4),
+                'rows_per_sec': round(self.rows[stage] / self.seconds[stage]) if self.seconds[stage] else None
+            }
+            for stage in STAGES if self.rows[stage]
+        }
+
+def parse_stage(rows, date_parsers):
+    for row, _ in rows:
+        total_price = importer.parse_price(row.total_price)
+        importer.detect_currency(row.total_price, total_price)
+        importer.parse_price(row.land_area)
+        importer.parse_rooms(row.rooms)
+        date_parsers['Created Time'].parse(row.created_time)
+        date_parsers['Modified Time'].parse(row.modified_time)
+
+def map_stage(rows, lookups):
+    for row, _ in rows:
+        lookups.type(row.type)
+        lookups.status(row.unit_for)
+        lookups.finishing(row.finished)
+        lookups.region(row.area)
+
+def transform_stage(rows, lookups):
+    return [importer.build_property_data(row, prop_number, lookups) for row, prop_number in rows]
+
+class SQLiteInserter:
+    """SQLite stand-in for the database: one transaction per batch, like PropertyBatchWriter"""
+    
+    def __init__(self, path, batch_size=importer.DEFAULT_BATCH_SIZE):
+        self.conn = sqlite3.connect(path)
+        self.batch_size = batch_size
+        columns = ', '.join(importer.INSERT_COLUMNS)
+        self.conn.execute(f"CREATE TABLE properties (id TEXT PRIMARY KEY, {columns}, UNIQUE (property_number))")
+        self.sql = f"INSERT INTO properties (id, {columns}) VALUES ({', '.join(['?'] * (len(importer.INSERT_COLUMNS) + 1))})"
+    
+    def insert(self, properties):
+        for i in range(0, len(properties), self.batch_size):
+            batch = properties[i:i + self.batch_size]
+            self.conn.executemany(self.sql, [
+                (str(uuid.uuid4()),) + tuple(p[col] for col in importer.INSERT_COLUMNS) for p in batch
+            ])
+            self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+
+class DatabaseInserter:
+    """PropertyBatchWriter against the configured database; benchmark rows are deleted afterwards"""
+    
+    def __init__(self, batch_size=importer.DEFAULT_BATCH_SIZE):
+        from db_pool import bulk_session, get_connection
+        self.conn = get_connection()
+        # Synthetic lookup IDs do not exist in the lookup tables
+        self.session = bulk_session(self.conn, foreign_key_checks=False)
+        self.session.__enter__()
+        self.writer = importer.PropertyBatchWriter(self.conn, batch_size)
+    
+    def insert(self, properties):
+        for property_data in properties:
+            self.writer.add(property_data)
+        self.writer.flush()
+    
+    def close(self):
+        self.writer.close()
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM properties WHERE company_id = %s AND property_number LIKE %s",
+                       (importer.TENANT_ID, f"{DEFAULT_PREFIX}%"))
+        self.conn.commit()
+        cursor.close()
+        self.session.__exit__(None, None, None)
+        self.conn.close()
+
+def benchmark_file(csv_path, inserter):
+    """Run every stage over one CSV; returns per-stage results"""
+    timer = StageTimer()
+    mappings = synthetic_mappings()
+    date_parsers = importer.new_date_parsers()
+    map_lookups = importer.PropertyLookups(mappings)
+    transform_lookups = importer.PropertyLookups(mappings)
+    stats = {'processed': 0, 'skipped': 0}
+    
+    with open(csv_path, 'rb') as f:
+        rows = importer.iter_new_properties(importer.iter_csv_rows(f), csv_path.name, set(), stats)
+        while True:
+            chunk = timer.run('read', 0, lambda: [
+                (row, prop_number) for row, prop_number, _ in islice(rows, BENCHMARK_CHUNK_ROWS)
+            ])
+            if not chunk:
+                break
+            
+            timer.run('parse', len(chunk), parse_stage, chunk, date_parsers)
+            timer.run('columnar', len(chunk), parse_numeric_columns, [row for row, _ in chunk])
+            timer.run('map', len(chunk), map_stage, chunk, map_lookups)
+            properties = timer.run('transform', len(chunk), transform_stage, chunk, transform_lookups)
+            timer.run('insert', len(properties), inserter.insert, properties)
+    
+    # Read throughput counts every row, duplicates and blanks included
+    timer.rows['read'] = stats['processed']
+    inserter.close()
+    return timer.results(), stats
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes, use_database=False, seed=DEFAULT_SEED, data_dir=None):
+    """Benchmark each row count; synthetic files are cached in data_dir"""
+    data_dir = Path(data_dir or Path(__file__).parent / DEFAULT_DATA_DIR)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np is not None,
+        'seed': seed,
+        'insert_target': 'database' if use_database else 'sqlite',
+        'runs': {}
+    }
+    
+    for size in sizes:
+        csv_path = data_dir / f"synthetic_{size}_{seed}.csv"
+        if not csv_path.exists():
+            print(f"📝 Generating {size} rows...")
+            started = time.perf_counter()
+            generate_csv(csv_path, size, seed=seed)
+            print(f"   {time.perf_counter() - started:.1f}s")
+        
+        if use_database:
+            inserter = DatabaseInserter()
+        else:
+            sqlite_path = data_dir / 'benchmark.sqlite3'
+            sqlite_path.unlink(missing_ok=True)
+            inserter = SQLiteInserter(sqlite_path)
+        
+        print(f"\n⏱️  {size} rows")
+        started = time.perf_counter()
+        stages, stats = benchmark_file(csv_path, inserter)
+        for stage, result in stages.items():
+            print(f"  {stage:10s} {result['rows_per_sec'] or 0:>10,} rows/sec  ({result['seconds']:.2f}s)")
+        
+        report['runs'][str(size)] = {
+            'rows': stats['processed'],
+            'skipped': stats['skipped'],
+            'total_seconds': round(time.perf_counter() - started, 4),
+            'stages': stages
+        }
+    
+    return report
+
+def compare_reports(previous, current):
+    """Print rows/sec changes against an earlier results file"""
+    print(f"\n📊 Compared with {previous.get('timestamp')} ({previous.get('git_revision')})")
+    for size, run in current['runs'].items():
+        old_run = previous.get('runs', {}).get(size)
+        if not old_run:
+            continue
+        print(f"  {size} rows:")
+        for stage, result in run['stages'].items():
+            old_rate = old_run['stages'].get(stage, {}).get('rows_per_sec')
+            if old_rate and result['rows_per_sec']:
+                change = (result['rows_per_sec'] - old_rate) / old_rate
+                print(f"    {stage:10s} {change:+7.1%}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the property importer on synthetic CSVs')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='comma-separated row counts, e.g. 10k,100k,1M')
+    parser.add_argument('--database', action='store_true',
+                        help='insert into the configured database instead of SQLite (use a scratch database)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--data-dir', default=None, help=f'where synthetic CSVs are cached (default: {DEFAULT_DATA_DIR})')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='results JSON file')
+    parser.add_argument('--compare', default=None, help='earlier results JSON to compare against')
+    args = parser.parse_args()
+    
+    sizes = [parse_row_count(size) for size in args.sizes.split(',')]
+    report = run_benchmarks(sizes, use_database=args.database, seed=args.seed, data_dir=args.data_dir)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to: {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_reports(json.load(f), report)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+CSV Sources
+Streaming access to plain and compressed (.gz / .bz2 / .xz) CSV exports
+
+A compressed export is decompressed incrementally as the CSV reader pulls
+lines, so nothing is unpacked to disk. Both the file on disk and the
+decompressed stream are read through buffers of --read-buffer bytes.
+Offsets seen by the readers (checkpoints, analyzer byte ranges) are
+positions in the decompressed stream; progress is measured in bytes
+consumed from disk, i.e. compressed bytes for a compressed export.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import time
+from pathlib import Path
+
+COMPRESSION_CODECS = {
+    '.gz': gzip,
+    '.bz2': bz2,
+    '.xz': lzma
+}
+
+DEFAULT_READ_BUFFER = 1024 * 1024
+PROGRESS_INTERVAL = 5  # Seconds between progress lines
+SIZE_UNITS = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+MIB = 1024 * 1024
+
+def parse_size(value):
+    """'256k' / '4M' / '65536' -> bytes"""
+    value = value.strip().lower().rstrip('b')
+    multiplier = SIZE_UNITS.get(value[-1:], 1)
+    return int(float(value.rstrip('kmg')) * multiplier)
+
+def compression_codec(path):
+    """gzip / bz2 / lzma module for a compressed export, None for plain CSV"""
+    return COMPRESSION_CODECS.get(Path(path).suffix.lower())
+
+def resolve_csv_path(directory, name):
+    """name in directory, or its first compressed variant that exists (name.gz, name.bz2, name.xz)"""
+    path = Path(directory) / name
+    if path.exists() or compression_codec(path):
+        return path
+    for suffix in COMPRESSION_CODECS:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return path
+
+class CsvSource:
+    """Binary stream of a CSV export, decompressed on the fly if the name ends in .gz/.bz2/.xz"""
+    
+    def __init__(self, path, buffer_size=DEFAULT_READ_BUFFER):
+        self.path = Path(path)
+        self.size = self.path.stat().st_size
+        self.raw = open(self.path, 'rb', buffering=buffer_size)
+        codec = compression_codec(self.path)
+        self.compressed = codec is not None
+        if self.compressed:
+            self.stream = io.BufferedReader(codec.open(self.raw, 'rb'), buffer_size)
+        else:
+            self.stream = self.raw
+    
+    def consumed(self):
+        """Bytes read from disk so far"""
+        return self.raw.tell()
+    
+    def close(self):
+        self.stream.close()
+        self.raw.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ProgressReporter:
+    """Periodic progress lines for one source, based on bytes consumed from disk"""
+    
+    def __init__(self, source, interval=PROGRESS_INTERVAL, label=None):
+        self.source = source
+        self.interval = interval
+        self.label = label or source.path.name
+        self.started = time.monotonic()
+        self.next_report = self.started + interval
+    
+    def maybe_report(self, rows):
+        """Cheap enough to call per row"""
+        if time.monotonic() >= self.next_report:
+            self.report(rows)
+    
+    def report(self, rows):
+        now = time.monotonic()
+        self.next_report = now + self.interval
+        consumed = self.source.consumed()
+        elapsed = now - self.started
+        fraction = consumed / self.source.size if self.source.size else 1.0
+        rate = consumed / MIB / elapsed if elapsed else 0.0
+        kind = 'compressed ' if self.source.compressed else ''
+        print(f"  📦 {self.label}: {fraction:6.1%} of {self.source.size / MIB:.1f} MiB {kind}read, "
+              f"{rate:.1f} MiB/s, {rows} rows")
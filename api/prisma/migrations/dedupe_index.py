@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Property Number Dedupe Index
+Persistent per-tenant index of imported property numbers
+
+File layout:
+  header line   "PNIDX2 <record_width> <record_count> <bloom_bytes> <crc_xor>\\n"
+  bloom filter  <bloom_bytes> bytes
+  records       <record_count> sorted property numbers, NUL-padded to <record_width>
+
+Lookups go through the Bloom filter first; only possible hits are
+confirmed with a binary search over the memory-mapped sorted records.
+The filter is doubled in memory whenever numbers added during a run
+outgrow it.
+
+The file from the last run is reused only if it holds exactly the
+tenant's property numbers in the database: same count and same XOR of
+the numbers' CRC32s (BIT_XOR(CRC32(property_number)) on the server, so
+nothing is streamed). A property deleted and another added elsewhere
+changes the XOR. Otherwise the index is rebuilt with one streaming query.
+"""
+import hashlib
+import mmap
+import os
+import zlib
+from pathlib import Path
+
+MAGIC = 'PNIDX2'
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+MIN_BLOOM_BYTES = 1024
+DEFAULT_INDEX_DIR = '.dedupe_index'
+
+def crc_xor(keys):
+    """XOR of the CRC32 of every key, as MySQL's BIT_XOR(CRC32(property_number))"""
+    value = 0
+    for key in keys:
+        value ^= zlib.crc32(key)
+    return value
+
+def bloom_positions(key_bytes, bit_count):
+    """Bit positions for a key (double hashing over one blake2b digest)"""
+    digest = hashlib.blake2b(key_bytes, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % bit_count for i in range(BLOOM_HASHES)]
+
+class PropertyNumberIndex:
+    """Set-like index of a tenant's property numbers backed by a sorted file"""
+    
+    def __init__(self, path, bloom, width=0, count=0, records_offset=0, checksum=0):
+        self.path = Path(path)
+        self.bloom = bloom
+        self.bit_count = len(bloom) * 8
+        self.width = width
+        self.count = count
+        self.records_offset = records_offset
+        self.checksum = checksum  # crc_xor() of the records on disk
+        self.added = set()
+        self._file = None
+        self._mmap = None
+        
+        if count:
+            self._file = open(self.path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    @classmethod
+    def index_path(cls, index_dir, tenant_id):
+        """Index file used for a tenant"""
+        return Path(index_dir) / f"{tenant_id}.idx"
+    
+    @classmethod
+    def open(cls, path):
+        """Open an index written by an earlier run"""
+        with open(path, 'rb') as f:
+            header = f.readline().decode('ascii').split()
+            if len(header) != 5 or header[0] != MAGIC:
+                raise ValueError(f"{path} is not a property number index")
+            _, width, count, bloom_bytes, checksum = header
+            bloom = bytearray(f.read(int(bloom_bytes)))
+            records_offset = f.tell()
+        
+        return cls(path, bloom, int(width), int(count), records_offset, int(checksum))
+    
+    @classmethod
+    def build(cls, path, property_numbers):
+        """Write a new index from an iterable of property numbers"""
+        write_index(path, {pn.encode('utf-8') for pn in property_numbers})
+        return cls.open(path)
+    
+    @classmethod
+    def preload(cls, conn, tenant_id, index_dir=DEFAULT_INDEX_DIR):
+        """The tenant's saved index, or a rebuild from the database if it is missing or stale"""
+        path = cls.index_path(index_dir, tenant_id)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(property_number)), 0) FROM properties WHERE company_id = %s",
+            (tenant_id,)
+        )
+        expected_count, expected_checksum = (int(v) for v in cursor.fetchone())
+        
+        if path.exists():
+            try:
+                index = cls.open(path)
+            except (ValueError, OSError):
+                index = None
+            if index is not None and (index.count, index.checksum) == (expected_count, expected_checksum):
+                cursor.close()
+                return index
+            if index is not None:
+                index.close()
+            print(f"  Dedupe index {path} is stale, rebuilding it from the database")
+        
+        cursor.execute("SELECT property_number FROM properties WHERE company_id = %s", (tenant_id,))
+        index = cls.build(path, (pn for (pn,) in cursor))
+        cursor.close()
+        return index
+    
+    def __contains__(self, property_number):
+        key = property_number.encode('utf-8')
+        for pos in bloom_positions(key, self.bit_count):
+            if not self.bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return key in self.added or self._search(key)
+    
+    def __len__(self):
+        return self.count + len(self.added)
+    
+    def add(self, property_number):
+        """Record a property number for the rest of the run (persisted by save())"""
+        if property_number in self:
+            return
+        key = property_number.encode('utf-8')
+        self.added.add(key)
+        if len(self) * BLOOM_BITS_PER_KEY > self.bit_count:
+            self._grow_bloom()
+            return
+        for pos in bloom_positions(key, self.bit_count):
+            self.bloom[pos >> 3] |= 1 << (pos & 7)
+    
+    def update(self, property_numbers):
+        for property_number in property_numbers:
+            self.add(property_number)
+    
+    def discard(self, property_numbers):
+        """Forget numbers added during the run (e.g. rows the database refused) before save()"""
+        self.added.difference_update(pn.encode('utf-8') for pn in property_numbers)
+    
+    def _grow_bloom(self):
+        """Double the Bloom filter and re-add every key"""
+        bloom = bytearray(max(len(self.bloom) * 2, len(self) * BLOOM_BITS_PER_KEY // 8))
+        bit_count = len(bloom) * 8
+        for key in self._keys():
+            for pos in bloom_positions(key, bit_count):
+                bloom[pos >> 3] |= 1 << (pos & 7)
+        self.bloom = bloom
+        self.bit_count = bit_count
+    
+    def _keys(self):
+        yield from (self._record(i).rstrip(b'\0') for i in range(self.count))
+        yield from self.added
+    
+    def _record(self, i):
+        start = self.records_offset + i * self.width
+        return self._mmap[start:start + self.width]
+    
+    def _search(self, key):
+        """Binary search the sorted on-disk records"""
+        if not self.count or len(key) > self.width:
+            return False
+        
+        padded = key.ljust(self.width, b'\0')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid) < padded:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self.count and self._record(lo) == padded
+    
+    def save(self):
+        """Merge numbers added during the run into the on-disk index"""
+        if not self.added:
+            return
+        
+        keys = set(self._keys())
+        self.close()
+        write_index(self.path, keys)
+        
+        saved = PropertyNumberIndex.open(self.path)
+        self.__dict__.update(saved.__dict__)
+    
+    def close(self):
+        if self._mmap:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
+
+def write_index(path, keys):
+    """Write sorted, padded records and their Bloom filter atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    keys = sorted(keys)
+    width = max((len(k) for k in keys), default=0)
+    bloom = bytearray(max(MIN_BLOOM_BYTES, len(keys) * BLOOM_BITS_PER_KEY // 8))
+    bit_count = len(bloom) * 8
+    for key in keys:
+        for pos in bloom_positions(key, bit_count):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+    
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(f"{MAGIC} {width} {len(keys)} {len(bloom)} {crc_xor(keys)}\n".encode('ascii'))
+        f.write(bloom)
+        for key in keys:
+            f.write(key.ljust(width, b'\0'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
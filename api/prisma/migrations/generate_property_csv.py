@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Synthetic Property CSV Generator
+Writes property exports shaped like property_data_*.csv for benchmarking
+
+Columns are taken from the file_columns recorded in csv_analysis.json, and
+values mimic the real exports: Arabic and English types, '????'
+placeholders, '|##|' combined statuses, mixed date formats, Arabic-Indic
+digits, multi-line descriptions and repeated property numbers. Output is
+deterministic for a given seed.
+
+Usage: python3 generate_property_csv.py --rows 100k [--layout property_data_1.csv] [--output FILE]
+"""
+import argparse
+import csv
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_SEED = 42
+DEFAULT_DUPLICATE_RATE = 0.05
+DEFAULT_PLACEHOLDER_RATE = 0.1
+DEFAULT_PREFIX = 'BENCH'
+DEFAULT_LAYOUT = 'property_data_2.csv'
+
+# Used when csv_analysis.json has not been generated yet
+FALLBACK_COLUMNS = [
+    'Property Number', 'Unit For', 'Last Follow in', 'Area', 'STATUS', 'Phase', 'The Floors', 'Type',
+    'ROOMS', 'SPACE', 'UNIT FACILITIES', 'Finished', 'EGAR CONTACT NO', 'Total Price',
+    'Property Name - Compound Name', 'LAST CALL', 'COMPOUND', 'PHOTO', 'Created Time', 'Modified Time',
+    'NOTE', 'Rent To', 'Description', 'Last Modified By', '0LX ADS', 'Property Offered By', 'Mobile No.',
+    'Name', 'Tel', 'Unit NO', 'BY ME', 'Handler', 'Property Image'
+]
+
+TYPES = [
+    'APARTMENT COMPOUND', 'APARTMENT OUT', 'Stand alone Compound', 'ViLLA OUT', 'Town House',
+    'Town House CORNER', 'Twin House', 'DUPLEX G+B', 'DUPLEX G+F', 'DUPLEX ROOF', 'ROOF', 'STUDIO',
+    'OFFICE SPACE', 'CLINIC', 'ADMIN BUILDING', 'RETAIL', 'BESMENT', 'FARMACY', 'I VILLA G',
+    'شاليه', 'شاليه', 'شاليه', 'اراضي', 'بنزينه', 'عماره', 'مستشفيات',
+    'apartment  compound', 'دوبلكس'  # Case/space variants and values with no mapping
+]
+
+STATUSES = [
+    'For sale', 'For Sale', 'For Rent', 'Sold Out', 'Naw rented', 'HOLD NOW', 'Recycle',
+    'For Rent |##| For Sale', 'For Rent |##| For sale |##| Sold Out', 'For Sale |##| HOLD NOW',
+    'For Sale |##| الرقم لم يرد', 'غير معروف'
+]
+
+FINISHING = [
+    'FULLY FINISHED', 'SEMI FINISHED', 'fully finished & furnished', 'Skeleton هيكل خرساني', 'SEMI FURNITURE'
+]
+
+REGIONS = [
+    'ستيلا هايتس', 'مراسي', 'ماونتن فيو راس الحكمه', 'Capital gardens palmhills', 'Eastown Sodic',
+    'DownTown', 'Mivida', 'Hyde Park', 'CFC', 'Dar masr', 'Easy Life', 'Bellagio', 'Amwag'
+]
+
+FLOORS = ['أرضي', 'اول', 'ثاني', 'اخير + روف', '3', '7 |##| 8', 'BESMENT |##| أرضي', '11']
+CATEGORIES = ['REIDENTIAL', 'ADMIN', 'COMMERCIAL', 'CLINICS', 'REIDENTIAL |##| ADMIN', 'ADMIN |##| CLINICS']
+COMPOUND_STATUS = ['داخل كمبوند', 'خارج كمبوند', 'مناطق تجاريه']
+ROOMS = ['1', '2', '3', '4', '5', '٣', '٢', '3 غرف', 'studio']
+
+DESCRIPTION_LINES = [
+    'للبيع شاليه دور ثاني', 'مفروش بالكامل', 'يري البحر وحمامات السباحه', 'شامل الصيانه والتنازل والعدادات',
+    'Fully finished unit with garden', 'Prime location, close to services', 'السعر قابل للتفاوض'
+]
+
+# Same formats the importer accepts, weighted towards the one real exports use
+DATE_FORMAT_WEIGHTS = [
+    ('%d-%m-%Y %H:%M:%S', 70),
+    ('%Y-%m-%d %H:%M:%S', 10),
+    ('%d/%m/%Y %H:%M:%S', 10),
+    ('%d-%m-%Y', 5),
+    ('%Y-%m-%d', 5)
+]
+
+ARABIC_DIGITS = str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩')
+DATE_RANGE_START = datetime(2019, 1, 1)
+DATE_RANGE_SECONDS = 6 * 365 * 24 * 3600
+
+def parse_row_count(value):
+    """'10k' / '1M' / '2500' -> int"""
+    value = value.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+def load_layout_columns(layout=DEFAULT_LAYOUT):
+    """Header of one of the analyzed exports, from csv_analysis.json"""
+    analysis_path = Path(__file__).parent / 'csv_analysis.json'
+    if analysis_path.exists():
+        with open(analysis_path, 'r', encoding='utf-8') as f:
+            file_columns = json.load(f).get('file_columns', {})
+        if layout in file_columns:
+            return file_columns[layout]
+    return FALLBACK_COLUMNS
+
+class RowGenerator:
+    """Deterministic synthetic export rows"""
+    
+    def __init__(self, seed=DEFAULT_SEED, duplicate_rate=DEFAULT_DUPLICATE_RATE,
+                 placeholder_rate=DEFAULT_PLACEHOLDER_RATE, prefix=DEFAULT_PREFIX):
+        self.random = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self.placeholder_rate = placeholder_rate
+        self.prefix = prefix
+        self.next_number = 1
+        self.date_formats = [fmt for fmt, _ in DATE_FORMAT_WEIGHTS]
+        self.date_weights = [weight for _, weight in DATE_FORMAT_WEIGHTS]
+    
+    def maybe(self, value):
+        """Value, or the '????' placeholder"""
+        return '????' if self.random.random() < self.placeholder_rate else value
+    
+    def property_number(self):
+        if self.next_number > 1 and self.random.random() < self.duplicate_rate:
+            return f"{self.prefix}{self.random.randrange(1, self.next_number):07d}"
+        number = f"{self.prefix}{self.next_number:07d}"
+        self.next_number += 1
+        return number
+    
+    def date(self):
+        value = DATE_RANGE_START + timedelta(seconds=self.random.randrange(DATE_RANGE_SECONDS))
+        fmt = self.random.choices(self.date_formats, self.date_weights)[0]
+        return value.strftime(fmt)
+    
+    def price(self):
+        roll = self.random.random()
+        if roll < 0.1:
+            return f"$ {self.random.randrange(50, 900) * 1000:,}"
+        if roll < 0.2:
+            return str(self.random.randrange(10, 900) * 1000)  # Small amounts are detected as USD
+        value = str(self.random.randrange(500, 50000) * 10000)
+        return value.translate(ARABIC_DIGITS) if roll < 0.25 else value
+    
+    def space(self):
+        value = str(self.random.randrange(40, 600))
+        return value.translate(ARABIC_DIGITS) if self.random.random() < 0.1 else value
+    
+    def description(self):
+        lines = self.random.sample(DESCRIPTION_LINES, self.random.randrange(1, 4))
+        return ' \n'.join(lines)
+    
+    def row(self):
+        r = self.random
+        return {
+            'Property Number': self.property_number(),
+            'Unit For': self.maybe(r.choice(STATUSES)),
+            'Type': self.maybe(r.choice(TYPES)),
+            'Finished': self.maybe(r.choice(FINISHING)),
+            'Area': self.maybe(r.choice(REGIONS)),
+            'The Floors': self.maybe(r.choice(FLOORS)),
+            'STATUS': self.maybe(r.choice(CATEGORIES)),
+            'داخل كمبوند / خارج كمبوند': self.maybe(r.choice(COMPOUND_STATUS)),
+            'COMPOUND': self.maybe(r.choice(COMPOUND_STATUS)),
+            'Phase': self.maybe(str(r.randrange(1, 20))),
+            'ROOMS': self.maybe(r.choice(ROOMS)),
+            'Total Price': self.maybe(self.price()),
+            'Land area': self.maybe(self.space()),
+            'SPACE': self.maybe(self.space()),
+            'Created Time': self.maybe(self.date()),
+            'Modified Time': self.maybe(self.date()),
+            'Last Follow in': self.date(),
+            'Property Name - Compound Name': f"{r.choice(REGIONS)} {r.randrange(1, 90)}",
+            'Building': str(r.randrange(1, 60)),
+            'BUILDING NAME': f"B{r.randrange(1, 60)}",
+            'Unit NO': str(r.randrange(1, 500)),
+            'Description': self.description(),
+            'Mobile No.': f"01{r.randrange(0, 3)}{r.randrange(10000000, 99999999)}",
+            'Name': r.choice(['احمد', 'محمد', 'Sara', 'Omar']),
+            'Property Offered By': r.choice(['المالك', 'Broker']),
+            'Handler': r.choice(['hossam', 'admin', '']),
+            'Last Modified By': 'admin'
+        }
+
+def generate_csv(path, row_count, columns=None, **generator_options):
+    """Write row_count synthetic rows to path; returns the number of distinct property numbers"""
+    columns = columns or load_layout_columns()
+    generator = RowGenerator(**generator_options)
+    
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore', restval='')
+        writer.writeheader()
+        for _ in range(row_count):
+            writer.writerow(generator.row())
+    
+    return generator.next_number - 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic property CSV export')
+    parser.add_argument('--rows', type=parse_row_count, default=parse_row_count('10k'),
+                        help='number of rows, e.g. 10k, 100k, 1M')
+    parser.add_argument('--layout', default=DEFAULT_LAYOUT,
+                        help='export whose header to copy (a file_columns key in csv_analysis.json)')
+    parser.add_argument('--output', default=None, help='output path (default: synthetic_<rows>.csv)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--duplicate-rate', type=float, default=DEFAULT_DUPLICATE_RATE)
+    parser.add_argument('--placeholder-rate', type=float, default=DEFAULT_PLACEHOLDER_RATE)
+    args = parser.parse_args()
+    
+    output = args.output or f"synthetic_{args.rows}.csv"
+    distinct = generate_csv(
+        output,
+        args.rows,
+        load_layout_columns(args.layout),
+        seed=args.seed,
+        duplicate_rate=args.duplicate_rate,
+        placeholder_rate=args.placeholder_rate
+    )
+    print(f"✅ Wrote {args.rows} rows ({distinct} distinct property numbers) to {output}")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Import Metrics
+Counters, latency histograms and rejected-row reasons for the importer
+
+Stages are timed into fixed log-spaced histograms, so metrics from worker
+processes can be shipped back and merged by adding bucket counts. A
+snapshot can be emitted as one JSON line (periodically, while the import
+runs) or written as a Prometheus textfile for node_exporter's textfile
+collector. ImportProfiler wraps cProfile for a sampled run.
+"""
+import bisect
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+# Upper bounds in seconds: 1µs .. ~67s, doubling
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** i for i in range(27))
+DEFAULT_EMIT_INTERVAL = 10  # Seconds between JSON lines
+METRIC_PREFIX = 'property_import'
+BATCH_EVENT_PREFIX = 'batch_'  # Counters named batch_* count batches, every other counter counts rows
+PROFILE_TOP_FUNCTIONS = 25
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds"""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+    
+    def merge(self, data):
+        for i, n in enumerate(data['counts']):
+            self.counts[i] += n
+        self.count += data['count']
+        self.sum += data['sum']
+    
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+    
+    def to_dict(self):
+        return {'counts': list(self.counts), 'count': self.count, 'sum': self.sum}
+
+class ImportMetrics:
+    """Thread-safe counters, per-stage histograms and rejected-row reasons"""
+    
+    def __init__(self, emit_path=None, emit_interval=DEFAULT_EMIT_INTERVAL, textfile_path=None):
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.rejected = Counter()
+        self.histograms = {}
+        self.started = time.time()
+        self.emit_path = emit_path
+        self.emit_interval = emit_interval
+        self.textfile_path = Path(textfile_path) if textfile_path else None
+        self.next_emit = time.monotonic() + emit_interval
+    
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+    
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+    
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+    
+    def reject(self, reason, n=1):
+        """Count rows dropped before reaching the database, by reason"""
+        with self.lock:
+            self.rejected[reason] += n
+    
+    def take(self):
+        """Return and reset everything recorded (used to ship metrics out of workers)"""
+        with self.lock:
+            data = {
+                'counters': dict(self.counters),
+                'rejected': dict(self.rejected),
+                'histograms': {stage: h.to_dict() for stage, h in self.histograms.items()}
+            }
+            self.counters = Counter()
+            self.rejected = Counter()
+            self.histograms = {}
+        return data
+    
+    def merge(self, data):
+        with self.lock:
+            self.counters.update(data['counters'])
+            self.rejected.update(data['rejected'])
+            for stage, histogram_data in data['histograms'].items():
+                self.histograms.setdefault(stage, Histogram()).merge(histogram_data)
+    
+    def snapshot(self):
+        """Summary suitable for a JSON line"""
+        with self.lock:
+            stages = {}
+            for stage, h in sorted(self.histograms.items()):
+                stages[stage] = {
+                    'count': h.count,
+                    'seconds': round(h.sum, 6),
+                    'p50': h.quantile(0.5),
+                    'p99': h.quantile(0.99)
+                }
+            return {
+                'timestamp': round(time.time(), 3),
+                'elapsed': round(time.time() - self.started, 3),
+                'counters': dict(self.counters),
+                'rejected': dict(self.rejected),
+                'stages': stages
+            }
+    
+    def maybe_emit(self):
+        """Emit if the interval has passed; cheap enough to call per row"""
+        if time.monotonic() >= self.next_emit:
+            self.emit()
+    
+    def emit(self):
+        """Write a JSON line and/or the Prometheus textfile now"""
+        self.next_emit = time.monotonic() + self.emit_interval
+        if self.emit_path:
+            line = json.dumps(self.snapshot(), ensure_ascii=False)
+            if self.emit_path == '-':
+                print(line, file=sys.stderr, flush=True)
+            else:
+                with open(self.emit_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+        if self.textfile_path:
+            self.write_textfile(self.textfile_path)
+    
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            batch_events = {
+                name: value for name, value in self.counters.items() if name.startswith(BATCH_EVENT_PREFIX)
+            }
+            lines.append(f"# TYPE {METRIC_PREFIX}_rows_total counter")
+            for name, value in sorted(self.counters.items()):
+                if name not in batch_events:
+                    lines.append(f'{METRIC_PREFIX}_rows_total{{event="{name}"}} {value}')
+            
+            lines.append(f"# TYPE {METRIC_PREFIX}_batches_total counter")
+            for name, value in sorted(batch_events.items()):
+                event = name[len(BATCH_EVENT_PREFIX):]
+                lines.append(f'{METRIC_PREFIX}_batches_total{{event="{event}"}} {value}')
+            
+            lines.append(f"# TYPE {METRIC_PREFIX}_rejected_rows_total counter")
+            for reason, value in sorted(self.rejected.items()):
+                lines.append(f'{METRIC_PREFIX}_rejected_rows_total{{reason="{reason}"}} {value}')
+            
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds histogram")
+            for stage, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {h.count}')
+        
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_update_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_update_seconds {time.time():.3f}")
+        return '\n'.join(lines) + '\n'
+    
+    def write_textfile(self, path):
+        """Write atomically so the collector never reads a partial file"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+    
+    def print_report(self):
+        """Per-stage totals and the rejected-row breakdown"""
+        snapshot = self.snapshot()
+        print("\n⏱️  Stage timings:")
+        for stage, s in snapshot['stages'].items():
+            p50 = f"{s['p50'] * 1e3:.3f}ms" if s['p50'] is not None else '-'
+            p99 = f"{s['p99'] * 1e3:.3f}ms" if s['p99'] is not None else '-'
+            print(f"  {stage:16s} {s['count']:>9} × total {s['seconds']:8.2f}s  p50 ≤ {p50}  p99 ≤ {p99}")
+        if snapshot['rejected']:
+            print("🚫 Rejected rows:")
+            for reason, n in sorted(snapshot['rejected'].items(), key=lambda item: -item[1]):
+                print(f"  {n:9d} × {reason}")
+
+class ImportProfiler:
+    """cProfile over the first sample_rows rows of the main thread (all rows if 0)"""
+    
+    def __init__(self, path, sample_rows=0):
+        self.path = path
+        self.sample_rows = sample_rows
+        self.rows = 0
+        self.profile = cProfile.Profile()
+        self.running = False
+    
+    def start(self):
+        self.profile.enable()
+        self.running = True
+    
+    def tick(self):
+        self.rows += 1
+        if self.running and self.sample_rows and self.rows >= self.sample_rows:
+            self.stop()
+    
+    def stop(self):
+        if not self.running:
+            return
+        self.profile.disable()
+        self.running = False
+        self.profile.dump_stats(self.path)
+        
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        print(f"\n🔬 Profile of {self.rows} rows saved to {self.path}")
+        print(out.getvalue())
@@ -3,33 +3,135 @@
 Property CSV Importer
 Imports property data from CSV files into the database
 """
+import argparse
 import csv
+import gzip
+import hashlib
 import json
+import os
+import queue
 import re
-import mysql.connector
+import tempfile
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from columnar_parse import parse_numeric_columns
+from csv_sources import DEFAULT_READ_BUFFER, CsvSource, ProgressReporter, parse_size, resolve_csv_path
+from db_pool import get_connection
+from dedupe_index import DEFAULT_INDEX_DIR, PropertyNumberIndex
+from import_metrics import DEFAULT_EMIT_INTERVAL, ImportMetrics, ImportProfiler
+from index_window import IndexWindow
+from property_aggregates import AGGREGATES_TABLE, AggregateDeltas, prepare_tenant as prepare_aggregates
+from property_ids import DEFAULT_ID_STRATEGY, ID_STRATEGIES, id_generator
 from pathlib import Path
 from datetime import datetime
 from decimal import Decimal
 
-# Database connection
-db_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'zerocall',
-    'database': 'contaboo',
-    'charset': 'utf8mb4'
-}
-
 # Configuration
 TENANT_ID = 'demo-tenant-1'
 USER_ID = 'super-admin-1'  # Super Admin from seed
-SKIP_FILE_3 = True  # Skip property_data_3.csv due to duplicates
 
-def get_db_connection():
-    """Create database connection"""
-    return mysql.connector.connect(**db_config)
+# CSV files to process (overlaps are filtered by the dedupe index); a .gz/.bz2/.xz copy is read if the plain file is absent
+CSV_FILES = (
+    'property_data_1.csv',
+    'property_data_2.csv',
+    'property_data_3.csv'
+)
+
+# Batched writes
+DEFAULT_BATCH_SIZE = 1000  # Rows per multi-row INSERT
+DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024  # Stay well below max_allowed_packet
+ROW_OVERHEAD_BYTES = 64  # Placeholders, commas and quoting per row
+
+# Rows the database refuses are bisected out of their batch and written here
+DEFAULT_REJECTS_FILE = 'import_rejects.csv'
+BATCH_SAVEPOINT = 'property_batch'
+
+# Date parsing
+DATE_FORMATS = [
+    '%d-%m-%Y %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%d-%m-%Y',
+    '%Y-%m-%d'
+]
+DATE_SNIFF_SAMPLE = 100  # Values per column used to pick the dominant format
+
+# Lookup resolution
+LOOKUP_CACHE_SIZE = 4096  # Distinct raw spellings memoized per column
+
+# Parallel transform
+DEFAULT_WORKERS = 1  # 1 = transform in the main process
+DEFAULT_CHUNK_SIZE = 500  # Rows per chunk sent to a worker process
+
+# Writer thread
+DEFAULT_QUEUE_SIZE = 5000  # Rows buffered between transform and writer (0 = no thread)
+
+# Checkpoints (--resume)
+DEFAULT_CHECKPOINT_FILE = '.import_checkpoint.json'
+
+# Incremental imports (--incremental)
+DEFAULT_DELTA_STATE_FILE = '.import_state.json'
 
-def load_lookup_mappings(conn):
+# CSV columns read by build_property_data (hashed to detect changed rows)
+SOURCE_COLUMNS = (
+    'Property Number', 'Type', 'Unit For', 'Finished', 'Area',
+    'Total Price', 'Land area', 'SPACE', 'ROOMS',
+    'Created Time', 'Modified Time',
+    'Property Name - Compound Name', 'Description',
+    'Building', 'BUILDING NAME', 'Unit NO', 'The Floors'
+)
+
+# Record fields read from each CSV row -> candidate columns in fallback order
+# (a later column is used when the earlier one is blank or absent)
+RECORD_FIELDS = {
+    'property_number': ('Property Number',),
+    'type': ('Type',),
+    'unit_for': ('Unit For',),
+    'finished': ('Finished',),
+    'area': ('Area',),
+    'total_price': ('Total Price',),
+    'land_area': ('Land area', 'SPACE'),
+    'rooms': ('ROOMS',),
+    'created_time': ('Created Time',),
+    'modified_time': ('Modified Time',),
+    'property_name': ('Property Name - Compound Name',),
+    'description': ('Description',),
+    'building': ('Building', 'BUILDING NAME'),
+    'unit_no': ('Unit NO',),
+    'floors': ('The Floors',)
+}
+
+# Bulk load (LOAD DATA LOCAL INFILE)
+STAGING_TABLE = 'properties_import_staging'
+
+# Columns written by the importer (id is generated separately)
+INSERT_COLUMNS = (
+    'company_id', 'created_by_id', 'property_number',
+    'type_id', 'status_id', 'finishing_status_id', 'region_id',
+    'property_name', 'title', 'description',
+    'land_area', 'total_area', 'rooms_count', 'bedrooms_count',
+    'sale_price', 'rental_price_monthly', 'currency_id',
+    'building_name', 'unit_number', 'floor_number',
+    'created_at', 'updated_at'
+)
+PROPERTY_NUMBER_INDEX = INSERT_COLUMNS.index('property_number')
+
+# Columns left untouched when an incremental import updates an existing row
+UPSERT_KEEP_COLUMNS = ('company_id', 'created_by_id', 'property_number', 'created_at')
+
+# Offline transform artifacts (--transform-only / --from-artifact)
+ARTIFACT_FORMAT = 'property-import-artifact'
+ARTIFACT_VERSION = 1
+ARTIFACT_COMPRESSION_LEVEL = 6
+DECIMAL_COLUMNS = ('land_area', 'total_area', 'sale_price', 'rental_price_monthly')
+DATETIME_COLUMNS = ('created_at', 'updated_at')
+
+def load_lookup_mappings(conn, tenant_id=TENANT_ID):
     """Load all lookup table mappings"""
     cursor = conn.cursor(dictionary=True)
     
@@ -43,30 +145,30 @@ def load_lookup_mappings(conn):
     }
     
     # Property categories
-    cursor.execute("SELECT id, name FROM property_categories WHERE company_id = %s", (TENANT_ID,))
+    cursor.execute("SELECT id, name FROM property_categories WHERE company_id = %s", (tenant_id,))
     for row in cursor.fetchall():
         mappings['categories'][row['name'].upper()] = row['id']
     
     # Property types
-    cursor.execute("SELECT id, name FROM property_types WHERE company_id = %s", (TENANT_ID,))
+    cursor.execute("SELECT id, name FROM property_types WHERE company_id = %s", (tenant_id,))
     for row in cursor.fetchall():
         name_key = row['name'].upper().replace(' ', '_')
         mappings['types'][name_key] = row['id']
     
     # Property statuses
-    cursor.execute("SELECT id, name FROM property_statuses WHERE company_id = %s", (TENANT_ID,))
+    cursor.execute("SELECT id, name FROM property_statuses WHERE company_id = %s", (tenant_id,))
     for row in cursor.fetchall():
         name_key = row['name'].upper().replace(' ', '_')
         mappings['statuses'][name_key] = row['id']
     
     # Finishing statuses
-    cursor.execute("SELECT id, name FROM finishing_statuses WHERE company_id = %s", (TENANT_ID,))
+    cursor.execute("SELECT id, name FROM finishing_statuses WHERE company_id = %s", (tenant_id,))
     for row in cursor.fetchall():
         name_key = row['name'].upper().replace(' ', '_')
         mappings['finishing'][name_key] = row['id']
     
     # Regions
-    cursor.execute("SELECT id, name, display_name FROM regions WHERE company_id = %s", (TENANT_ID,))
+    cursor.execute("SELECT id, name, display_name FROM regions WHERE company_id = %s", (tenant_id,))
     for row in cursor.fetchall():
         mappings['regions'][row['name']] = row['id']
         if row['display_name']:
@@ -80,6 +182,30 @@ def load_lookup_mappings(conn):
     cursor.close()
     return mappings
 
+def mappings_fingerprint(mappings):
+    """Stable hash of a load_lookup_mappings() result"""
+    return hashlib.blake2b(json.dumps(mappings, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+def save_mappings_snapshot(path, mappings):
+    """Write lookup mappings to disk for a transform run without database access"""
+    snapshot = {
+        'tenant_id': TENANT_ID,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': mappings_fingerprint(mappings),
+        'mappings': mappings
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+
+def load_mappings_snapshot(path):
+    """Read mappings written by save_mappings_snapshot()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    
+    if snapshot['tenant_id'] != TENANT_ID:
+        raise ValueError(f"Mappings snapshot {path} is for tenant {snapshot['tenant_id']}, not {TENANT_ID}")
+    return snapshot['mappings']
+
 def parse_price(price_str):
     """Parse price from various formats"""
     if not price_str or price_str == '????':
@@ -113,61 +239,176 @@ def parse_date(date_str):
     if not date_str or date_str == '????':
         return None
     
-    date_formats = [
-        '%d-%m-%Y %H:%M:%S',
-        '%Y-%m-%d %H:%M:%S',
-        '%d/%m/%Y %H:%M:%S',
-        '%d-%m-%Y',
-        '%Y-%m-%d'
-    ]
-    
-    for fmt in date_formats:
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
-        except:
+        except ValueError:
             continue
     
     return None
 
+# strptime directive -> (regex, datetime() argument position)
+DATE_DIRECTIVES = {
+    '%Y': (r'(\d{4})', 0),
+    '%m': (r'(\d{1,2})', 1),
+    '%d': (r'(\d{1,2})', 2),
+    '%H': (r'(\d{1,2})', 3),
+    '%M': (r'(\d{1,2})', 4),
+    '%S': (r'(\d{1,2})', 5)
+}
+
+def compile_date_format(fmt):
+    """Compile a strptime format into a regex and the datetime() order of its groups"""
+    pattern = re.escape(fmt)
+    positions = []
+    for directive in re.findall(r'%[A-Za-z]', fmt):
+        regex, position = DATE_DIRECTIVES[directive]
+        pattern = pattern.replace(directive, regex, 1)
+        positions.append(position)
+    
+    # Argument i of datetime() is group order[i] of the match
+    order = [positions.index(i) for i in sorted(positions)]
+    # ASCII: strptime only takes 0-9, while \d alone would also match e.g. Arabic-Indic digits
+    return re.compile(pattern, re.ASCII), order
+
+class DateParser:
+    """Per-column date parser that locks onto the column's dominant format
+    
+    The first DATE_SNIFF_SAMPLE values are matched against every format's
+    regex; afterwards only the most common one is tried, and anything it
+    does not match falls back to parse_date(). The formats are mutually
+    exclusive, so the result is always the same as parse_date().
+    """
+    
+    def __init__(self, formats=DATE_FORMATS, sample_size=DATE_SNIFF_SAMPLE):
+        self.compiled = [compile_date_format(fmt) for fmt in formats]
+        self.sample_size = sample_size
+        self.fast_path = None
+        self.format_counts = Counter()
+        self.sampled = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _match(compiled, value):
+        regex, order = compiled
+        match = regex.fullmatch(value)
+        if not match:
+            return None
+        groups = match.groups()
+        try:
+            return datetime(*[int(groups[i]) for i in order])
+        except ValueError:
+            return None
+    
+    def parse(self, value):
+        """Parse a date value, None for blanks and unparseable values"""
+        if not value or value == '????':
+            return None
+        
+        if self.fast_path is not None:
+            result = self._match(self.compiled[self.fast_path], value)
+            if result is not None:
+                self.hits += 1
+                return result
+            
+            # Re-sniff if the column's format has changed (e.g. a new file)
+            self.misses += 1
+            if self.misses > self.hits + self.sample_size:
+                self.fast_path = None
+                self.format_counts.clear()
+                self.sampled = self.hits = self.misses = 0
+            return parse_date(value)
+        
+        result = None
+        for i, compiled in enumerate(self.compiled):
+            result = self._match(compiled, value)
+            if result is not None:
+                self.format_counts[i] += 1
+                break
+        
+        self.sampled += 1
+        if self.sampled >= self.sample_size and self.format_counts:
+            self.fast_path = self.format_counts.most_common(1)[0][0]
+        
+        return result if result is not None else parse_date(value)
+
+DATE_COLUMNS = ('Created Time', 'Modified Time')
+
+def new_date_parsers():
+    """One parser per date column, so each column keeps its own dominant format"""
+    return {column: DateParser() for column in DATE_COLUMNS}
+
+_run_now = None
+
+def run_now():
+    """Timestamp used for every missing date in this run"""
+    global _run_now
+    if _run_now is None:
+        _run_now = datetime.now()
+    return _run_now
+
+# CSV value -> lookup code
+TYPE_MAPPING = {
+    'Stand alone Compound': 'STANDALONE_COMPOUND',
+    'APARTMENT COMPOUND': 'APARTMENT_COMPOUND',
+    'APARTMENT OUT': 'APARTMENT_OUT',
+    'ViLLA OUT': 'VILLA_OUT',
+    'Town House': 'TOWNHOUSE',
+    'Town House CORNER': 'TOWNHOUSE_CORNER',
+    'Town House . M': 'TOWNHOUSE',
+    'Twin House': 'TWIN_HOUSE',
+    'DUPLEX G+B': 'DUPLEX_GB',
+    'DUPLEX G+F': 'DUPLEX_GF',
+    'DUPLEX ROOF': 'DUPLEX_ROOF',
+    'ROOF': 'ROOF',
+    'STUDIO': 'STUDIO',
+    'OFFICE SPACE': 'OFFICE_SPACE',
+    'CLINIC': 'CLINIC',
+    'ADMIN BUILDING': 'ADMIN_BUILDING',
+    'ADMIN & RETAIL BUILDING': 'ADMIN_RETAIL_BUILDING',
+    'RETAIL': 'RETAIL',
+    'RETAIL BUILDING': 'RETAIL_BUILDING',
+    'BESMENT': 'BASEMENT',
+    'FACTORY': 'FACTORY',
+    'FARMACY': 'PHARMACY',
+    'شاليه': 'CHALET',
+    'I VILLA G': 'I_VILLA_G',
+    'I VILLA R': 'I_VILLA_R',
+    'اراضي': 'LAND',
+    'بنزينه': 'GAS_STATION',
+    'عماره': 'BUILDING',
+    'مستشفيات': 'HOSPITAL'
+}
+
+STATUS_MAPPING = {
+    'For sale': 'FOR_SALE',
+    'For Sale': 'FOR_SALE',
+    'For Rent': 'FOR_RENT',
+    'Sold Out': 'SOLD_OUT',
+    'Naw rented': 'NOW_RENTED',
+    'Hold Naw': 'HOLD',
+    'HOLD NOW': 'HOLD',
+    'Recycle': 'RECYCLE',
+    'غير معروف': 'UNKNOWN'
+}
+
+FINISHING_MAPPING = {
+    'FULLY FINISHED': 'FULLY_FINISHED',
+    'SEMI FINISHED': 'SEMI_FINISHED',
+    'fully finished & furnished': 'FULLY_FURNISHED',
+    'Skeleton هيكل خرساني': 'SKELETON',
+    'SEMI FURNITURE': 'SEMI_FURNITURE'
+}
+
+COMBINED_STATUS_SEPARATOR = '|##|'
+
 def map_property_type(type_str, mappings):
     """Map CSV type to database type_id"""
     if not type_str or type_str == '????':
         return None
     
-    # Mapping dictionary
-    type_mapping = {
-        'Stand alone Compound': 'STANDALONE_COMPOUND',
-        'APARTMENT COMPOUND': 'APARTMENT_COMPOUND',
-        'APARTMENT OUT': 'APARTMENT_OUT',
-        'ViLLA OUT': 'VILLA_OUT',
-        'Town House': 'TOWNHOUSE',
-        'Town House CORNER': 'TOWNHOUSE_CORNER',
-        'Town House . M': 'TOWNHOUSE',
-        'Twin House': 'TWIN_HOUSE',
-        'DUPLEX G+B': 'DUPLEX_GB',
-        'DUPLEX G+F': 'DUPLEX_GF',
-        'DUPLEX ROOF': 'DUPLEX_ROOF',
-        'ROOF': 'ROOF',
-        'STUDIO': 'STUDIO',
-        'OFFICE SPACE': 'OFFICE_SPACE',
-        'CLINIC': 'CLINIC',
-        'ADMIN BUILDING': 'ADMIN_BUILDING',
-        'ADMIN & RETAIL BUILDING': 'ADMIN_RETAIL_BUILDING',
-        'RETAIL': 'RETAIL',
-        'RETAIL BUILDING': 'RETAIL_BUILDING',
-        'BESMENT': 'BASEMENT',
-        'FACTORY': 'FACTORY',
-        'FARMACY': 'PHARMACY',
-        'شاليه': 'CHALET',
-        'I VILLA G': 'I_VILLA_G',
-        'I VILLA R': 'I_VILLA_R',
-        'اراضي': 'LAND',
-        'بنزينه': 'GAS_STATION',
-        'عماره': 'BUILDING',
-        'مستشفيات': 'HOSPITAL'
-    }
-    
-    mapped = type_mapping.get(type_str)
+    mapped = TYPE_MAPPING.get(type_str)
     return mappings['types'].get(mapped) if mapped else None
 
 def map_property_status(status_str, mappings):
@@ -175,24 +416,11 @@ def map_property_status(status_str, mappings):
     if not status_str or status_str == '????':
         return None
     
-    # Mapping dictionary (handle combined statuses)
-    status_mapping = {
-        'For sale': 'FOR_SALE',
-        'For Sale': 'FOR_SALE',
-        'For Rent': 'FOR_RENT',
-        'Sold Out': 'SOLD_OUT',
-        'Naw rented': 'NOW_RENTED',
-        'Hold Naw': 'HOLD',
-        'HOLD NOW': 'HOLD',
-        'Recycle': 'RECYCLE',
-        'غير معروف': 'UNKNOWN'
-    }
-    
     # Handle combined statuses (take first one)
-    if '|##|' in status_str:
-        status_str = status_str.split('|##|')[0].strip()
+    if COMBINED_STATUS_SEPARATOR in status_str:
+        status_str = status_str.split(COMBINED_STATUS_SEPARATOR)[0].strip()
     
-    mapped = status_mapping.get(status_str)
+    mapped = STATUS_MAPPING.get(status_str)
     return mappings['statuses'].get(mapped) if mapped else None
 
 def map_finishing_status(finishing_str, mappings):
@@ -200,15 +428,7 @@ def map_finishing_status(finishing_str, mappings):
     if not finishing_str or finishing_str == '????':
         return None
     
-    finishing_mapping = {
-        'FULLY FINISHED': 'FULLY_FINISHED',
-        'SEMI FINISHED': 'SEMI_FINISHED',
-        'fully finished & furnished': 'FULLY_FURNISHED',
-        'Skeleton هيكل خرساني': 'SKELETON',
-        'SEMI FURNITURE': 'SEMI_FURNITURE'
-    }
-    
-    mapped = finishing_mapping.get(finishing_str)
+    mapped = FINISHING_MAPPING.get(finishing_str)
     return mappings['finishing'].get(mapped) if mapped else None
 
 def map_region(area_str, mappings):
@@ -218,6 +438,119 @@ def map_region(area_str, mappings):
     
     return mappings['regions'].get(area_str)
 
+def normalize_lookup_value(value):
+    """Case- and whitespace-insensitive key for lookup values"""
+    return ' '.join(value.split()).casefold()
+
+def first_status(value):
+    """Combined statuses map to their first entry"""
+    return value.split(COMBINED_STATUS_SEPARATOR)[0]
+
+class LookupResolver:
+    """Resolves raw CSV values of one column straight to lookup IDs
+    
+    Raw values are normalized (case, whitespace, optional preprocessing
+    such as combined statuses) and memoized in a bounded LRU, so each
+    distinct spelling is only normalized once per run.
+    """
+    
+    def __init__(self, name, value_ids, preprocess=None, cache_size=LOOKUP_CACHE_SIZE):
+        self.name = name
+        self.preprocess = preprocess
+        self.ids = {normalize_lookup_value(value): id for value, id in value_ids.items() if id}
+        self.resolved = 0
+        self.unmapped = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+        self._cache_counted = (0, 0)  # cache_info() hits/misses already added to the counters
+    
+    def _lookup_uncached(self, raw):
+        value = self.preprocess(raw) if self.preprocess else raw
+        return self.ids.get(normalize_lookup_value(value))
+    
+    def resolve(self, raw):
+        """Lookup ID for a raw CSV value, or None"""
+        if not raw or raw == '????':
+            return None
+        
+        resolved_id = self._lookup(raw)
+        if resolved_id is None:
+            self.unmapped[raw] += 1
+        else:
+            self.resolved += 1
+        return resolved_id
+    
+    def cache_info(self):
+        """(hits, misses) of the normalization cache, including stats merged from workers"""
+        info = self._lookup.cache_info()
+        counted_hits, counted_misses = self._cache_counted
+        self.cache_hits += info.hits - counted_hits
+        self.cache_misses += info.misses - counted_misses
+        self._cache_counted = (info.hits, info.misses)
+        return self.cache_hits, self.cache_misses
+    
+    def take_stats(self):
+        """Return and reset resolution and cache counts (used to ship stats out of workers)"""
+        stats = (self.resolved, self.unmapped) + self.cache_info()
+        self.resolved = 0
+        self.unmapped = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        return stats
+    
+    def merge_stats(self, stats):
+        resolved, unmapped, cache_hits, cache_misses = stats
+        self.resolved += resolved
+        self.unmapped.update(unmapped)
+        self.cache_hits += cache_hits
+        self.cache_misses += cache_misses
+
+class PropertyLookups:
+    """All lookup resolvers for a run, compiled once from load_lookup_mappings()"""
+    
+    def __init__(self, mappings):
+        self.resolvers = {
+            'type': LookupResolver('Type', {
+                raw: mappings['types'].get(code) for raw, code in TYPE_MAPPING.items()
+            }),
+            'status': LookupResolver('Unit For', {
+                raw: mappings['statuses'].get(code) for raw, code in STATUS_MAPPING.items()
+            }, preprocess=first_status),
+            'finishing': LookupResolver('Finished', {
+                raw: mappings['finishing'].get(code) for raw, code in FINISHING_MAPPING.items()
+            }),
+            'region': LookupResolver('Area', mappings['regions'])
+        }
+        self.type = self.resolvers['type'].resolve
+        self.status = self.resolvers['status'].resolve
+        self.finishing = self.resolvers['finishing'].resolve
+        self.region = self.resolvers['region'].resolve
+        self.currencies = mappings['currencies']
+        self.for_sale_id = mappings['statuses'].get('FOR_SALE')
+        self.for_rent_id = mappings['statuses'].get('FOR_RENT')
+        # Parsers sniff and count as they go, so each tenant (and worker) needs its own
+        self.date_parsers = new_date_parsers()
+        self.metrics = None  # Set to an ImportMetrics to time lookups and transforms
+    
+    def take_stats(self):
+        return {key: resolver.take_stats() for key, resolver in self.resolvers.items()}
+    
+    def merge_stats(self, stats):
+        for key, resolver_stats in stats.items():
+            self.resolvers[key].merge_stats(resolver_stats)
+    
+    def print_report(self, top=5):
+        """Resolution counts and the unmapped values that cost the most rows"""
+        print("\n🔎 Lookup resolution:")
+        for resolver in self.resolvers.values():
+            unmapped_rows = sum(resolver.unmapped.values())
+            hits, misses = resolver.cache_info()
+            print(f"  {resolver.name}: {resolver.resolved} resolved, {unmapped_rows} unmapped "
+                  f"({len(resolver.unmapped)} distinct values), cache {hits} hits / {misses} misses")
+            for raw, count in resolver.unmapped.most_common(top):
+                print(f"    {count:6d} × {raw}")
+
 def parse_rooms(rooms_str):
     """Parse room count from various formats"""
     if not rooms_str or rooms_str == '????':
@@ -230,11 +563,1042 @@ def parse_rooms(rooms_str):
     except:
         return None
 
-def import_properties():
+def build_property_data(row, prop_number, lookups, numeric=None, tenant_id=TENANT_ID, user_id=USER_ID):
+    """Transform a PropertyRecord into a properties row dict
+    
+    numeric optionally carries (total_price, currency_code, land_area,
+    rooms_count) already parsed for the whole chunk by columnar_parse.
+    """
+    metrics = lookups.metrics
+    if metrics:
+        started = time.perf_counter()
+    
+    type_id = lookups.type(row.type)
+    status_id = lookups.status(row.unit_for)
+    finishing_id = lookups.finishing(row.finished)
+    region_id = lookups.region(row.area)
+    
+    if metrics:
+        metrics.observe('lookup', time.perf_counter() - started)
+    
+    if numeric:
+        total_price, currency_code, land_area, rooms_count = numeric
+    else:
+        total_price = parse_price(row.total_price)
+        currency_code = detect_currency(row.total_price, total_price)
+        land_area = parse_price(row.land_area)
+        rooms_count = parse_rooms(row.rooms)
+    currency_id = lookups.currencies.get(currency_code)
+    
+    created_at = lookups.date_parsers['Created Time'].parse(row.created_time) or run_now()
+    updated_at = lookups.date_parsers['Modified Time'].parse(row.modified_time) or run_now()
+    
+    if metrics:
+        metrics.observe('transform', time.perf_counter() - started)
+    
+    return {
+        'id': None,  # Not inserted from here: the writer's new_id (--id-strategy) or the database's UUID() fills it
+        'company_id': tenant_id,
+        'created_by_id': user_id,
+        'property_number': prop_number,
+        'type_id': type_id,
+        'status_id': status_id,
+        'finishing_status_id': finishing_id,
+        'region_id': region_id,
+        'property_name': (row.property_name or '')[:500],
+        'title': f"Property {prop_number}",
+        'description': (row.description or '')[:2000],
+        'land_area': land_area,
+        'total_area': land_area,
+        'rooms_count': rooms_count,
+        'bedrooms_count': rooms_count,
+        'sale_price': total_price if status_id == lookups.for_sale_id else None,
+        'rental_price_monthly': total_price if status_id == lookups.for_rent_id else None,
+        'currency_id': currency_id,
+        'building_name': (row.building or '')[:255],
+        'unit_number': (row.unit_no or '')[:50],
+        'floor_number': (row.floors or '')[:100],
+        'created_at': created_at,
+        'updated_at': updated_at
+    }
+
+class RejectsWriter:
+    """CSV of rows the database refused, with the error attached (created on the first reject)"""
+    
+    def __init__(self, path, append=False):
+        self.path = Path(path)
+        self.append = append
+        self.file = None
+        self.writer = None
+        self.count = 0
+    
+    def add(self, params, error):
+        if self.writer is None:
+            write_header = not (self.append and self.path.exists() and self.path.stat().st_size)
+            self.file = open(self.path, 'a' if self.append else 'w', encoding='utf-8', newline='')
+            self.writer = csv.writer(self.file)
+            self.append = True  # Reopening after close() (e.g. one writer per batch) must not truncate
+            if write_header:
+                self.writer.writerow(('error_code', 'error') + INSERT_COLUMNS)
+        # A client-generated id is appended after INSERT_COLUMNS; it was never stored
+        self.writer.writerow((getattr(error, 'errno', ''), str(error)) + tuple(
+            to_tsv_field(value) if isinstance(value, datetime) else value for value in params[:len(INSERT_COLUMNS)]
+        ))
+        self.count += 1
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+class ForeignPropertyNumber(Exception):
+    """An upserted row's property_number already belongs to another tenant"""
+
+class PropertyBatchWriter:
+    """Accumulates property rows and flushes them as multi-row INSERTs
+    
+    Each statement runs under a savepoint. When a batch fails it is rolled
+    back to the savepoint and split in half, recursively, so the good rows
+    still go in as a few multi-row statements and only the rows the database
+    refuses end up in the rejects file.
+    
+    With new_id (see property_ids.py) each row carries its own primary key
+    instead of the database calling UUID(). An upsert never touches
+    another tenant's row, so rows whose property_number belongs to another
+    tenant are rejected up front instead of being silently left out. With
+    delta (see DeltaState), the rows of each batch are recorded as imported
+    once it commits. With aggregates (see
+    property_aggregates.py) the summary counts of the rows that went in
+    are upserted in the same transaction as the batch.
+    """
+    
+    def __init__(self, conn, batch_size=DEFAULT_BATCH_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES, checkpoint=None,
+                 upsert=False, metrics=None, rejects=None, new_id=None, aggregates=None, delta=None,
+                 tenant_id=TENANT_ID):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.checkpoint = checkpoint
+        self.upsert = upsert
+        self.metrics = metrics or ImportMetrics()
+        self.rejects = rejects
+        self.new_id = new_id
+        self.aggregates = aggregates
+        self.delta = delta
+        self.tenant_id = tenant_id
+        self.failed_numbers = set()
+        self.rows = []
+        self.batch_bytes = 0
+        self.position = None
+        self.imported = checkpoint.state['imported'] if checkpoint and checkpoint.state else 0
+        self.failed = checkpoint.state['failed'] if checkpoint and checkpoint.state else 0
+        self.committed_imported = self.imported
+    
+    @property
+    def pending_numbers(self):
+        """Property numbers queued or in the batch being written, i.e. not committed yet"""
+        return {params[PROPERTY_NUMBER_INDEX] for params in self.rows}
+    
+    def add(self, property_data, position=None):
+        """Queue a row, flushing when the batch is full"""
+        params = tuple(property_data[col] for col in INSERT_COLUMNS)
+        if self.new_id:
+            params += (self.new_id(),)
+        row_bytes = estimate_row_bytes(params)
+        
+        # Keep the statement under the byte ceiling (max_allowed_packet)
+        if self.rows and self.batch_bytes + row_bytes > self.max_batch_bytes:
+            self.flush()
+        
+        self.rows.append(params)
+        self.batch_bytes += row_bytes
+        self.position = position
+        
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Write queued rows in one statement and commit"""
+        if not self.rows:
+            return
+        
+        rows = self.rows
+        writable = self.reject_foreign(rows) if self.upsert else rows
+        error = self.insert(writable, 'db_execute') if writable else None
+        if error and len(writable) == 1:
+            self.reject(writable[0], error)
+        elif error:
+            print(f"  ⚠️  Batch of {len(writable)} failed ({error}), isolating the bad rows...")
+            self.metrics.count('batch_bisected')
+            self.bisect(writable)
+        
+        if self.aggregates:
+            with self.metrics.timer('db_aggregates'):
+                self.aggregates.flush(self.cursor)
+        
+        checkpointed = self.checkpoint and self.position
+        if checkpointed:
+            batch_numbers = [params[PROPERTY_NUMBER_INDEX] for params in rows]
+            self.checkpoint.prepare(self.position, batch_numbers, self.imported, self.failed)
+        with self.metrics.timer('db_commit'):
+            self.conn.commit()
+        # The rows stay queued until here, so an abort() before the commit knows what was lost
+        self.rows = []
+        self.batch_bytes = 0
+        self.committed_imported = self.imported
+        if checkpointed:
+            self.checkpoint.commit()
+        if self.delta:
+            self.delta.record(params[PROPERTY_NUMBER_INDEX] for params in writable
+                              if params[PROPERTY_NUMBER_INDEX] not in self.failed_numbers)
+        self.metrics.count('batch_committed')
+        print(f"  Imported {self.imported} properties...")
+    
+    def reject_foreign(self, rows):
+        """Reject rows whose property_number belongs to another tenant; returns the rest"""
+        numbers = [params[PROPERTY_NUMBER_INDEX] for params in rows]
+        self.cursor.execute(
+            f"SELECT property_number, company_id FROM properties "
+            f"WHERE property_number IN ({', '.join(['%s'] * len(numbers))}) AND company_id <> %s",
+            (*numbers, self.tenant_id)
+        )
+        owners = dict(self.cursor.fetchall())
+        if not owners:
+            return rows
+        
+        for params in rows:
+            number = params[PROPERTY_NUMBER_INDEX]
+            if number in owners:
+                self.reject(params, ForeignPropertyNumber(f"property_number {number} belongs to tenant {owners[number]}"))
+        return [params for params in rows if params[PROPERTY_NUMBER_INDEX] not in owners]
+    
+    def reject(self, params, error):
+        """Count a refused row and write it to the rejects file"""
+        print(f"  ❌ Error importing {params[PROPERTY_NUMBER_INDEX]}: {error}")
+        self.metrics.reject(f"insert_error:{type(error).__name__}")
+        self.failed += 1
+        self.failed_numbers.add(params[PROPERTY_NUMBER_INDEX])
+        if self.rejects:
+            self.rejects.add(params, error)
+    
+    def insert(self, rows, stage):
+        """INSERT rows under a savepoint; returns the error if the database refused them"""
+        self.cursor.execute(f"SAVEPOINT {BATCH_SAVEPOINT}")
+        previous = None
+        try:
+            # An upsert may move existing rows to another type/status/region group
+            if self.aggregates and self.upsert:
+                previous = self.aggregates.previous_groups(self.cursor, rows)
+            with self.metrics.timer(stage):
+                self.cursor.execute(build_insert_sql(len(rows), self.upsert, bool(self.new_id)),
+                                    [v for params in rows for v in params])
+        except Exception as error:
+            try:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {BATCH_SAVEPOINT}")
+            except Exception:
+                # The transaction itself is gone (deadlock, lost connection), not a bad row
+                raise error
+            return error
+        
+        self.cursor.execute(f"RELEASE SAVEPOINT {BATCH_SAVEPOINT}")
+        if self.aggregates:
+            self.aggregates.add(rows, previous)
+        self.imported += len(rows)
+        self.metrics.count('imported', len(rows))
+        return None
+    
+    def bisect(self, rows):
+        """Split a failed batch until every refused row is isolated"""
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            if not half:
+                continue
+            error = self.insert(half, 'db_execute_bisect')
+            if not error:
+                continue
+            if len(half) > 1:
+                self.bisect(half)
+                continue
+            self.reject(half[0], error)
+    
+    def close(self):
+        """Flush remaining rows and release the cursor"""
+        self.flush()
+        self.cursor.close()
+        if self.rejects:
+            self.rejects.close()
+    
+    def abort(self):
+        """Drop queued rows and roll back the open batch"""
+        self.rows = []
+        self.imported = self.committed_imported
+        if self.aggregates:
+            self.aggregates.discard()
+        self.conn.rollback()
+        self.cursor.close()
+        if self.rejects:
+            self.rejects.close()
+
+def estimate_row_bytes(params):
+    """Rough size of a row once rendered into the INSERT statement"""
+    return ROW_OVERHEAD_BYTES + sum(len(str(v)) * 2 for v in params if v is not None)
+
+def build_insert_sql(row_count, upsert=False, client_ids=False, table='properties'):
+    """Build a multi-row INSERT (or upsert) for the given number of rows
+    
+    client_ids: each row's id is passed as its last parameter instead of UUID()
+    """
+    if client_ids:
+        columns = INSERT_COLUMNS + ('id',)
+        row_placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    else:
+        columns = ('id',) + INSERT_COLUMNS
+        row_placeholder = '(UUID(), ' + ', '.join(['%s'] * len(INSERT_COLUMNS)) + ')'
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        + ', '.join([row_placeholder] * row_count)
+    )
+    
+    if upsert:
+        # property_number is unique across tenants; never touch another tenant's row
+        sql += ' ON DUPLICATE KEY UPDATE ' + ', '.join(
+            f"{col} = IF(company_id = VALUES(company_id), VALUES({col}), {col})"
+            for col in INSERT_COLUMNS if col not in UPSERT_KEEP_COLUMNS
+        )
+    
+    return sql
+
+def to_tsv_field(value):
+    """Render a value for LOAD DATA's default TSV escaping"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+class BulkLoadWriter:
+    """Stages rows in a TSV file and loads them with LOAD DATA LOCAL INFILE"""
+    
+    def __init__(self, conn, metrics=None, new_id=None, aggregates=None):
+        self.conn = conn
+        self.metrics = metrics or ImportMetrics()
+        self.new_id = new_id
+        self.aggregates = aggregates
+        self.imported = 0
+        self.failed = 0
+        self.failed_numbers = set()  # The load is all-or-nothing: a failure raises from close()
+        self.staged = 0
+        self.timings = {}
+        self.started = time.perf_counter()
+        fd, self.staging_path = tempfile.mkstemp(prefix='properties_', suffix='.tsv')
+        self.staging_file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+    
+    def add(self, property_data, position=None):
+        """Append a row to the staging file"""
+        fields = [to_tsv_field(property_data[col]) for col in INSERT_COLUMNS]
+        if self.new_id:
+            fields.append(self.new_id())
+        self.staging_file.write('\t'.join(fields) + '\n')
+        self.staged += 1
+    
+    def flush(self):
+        """Rows are only written to the database in close()"""
+    
+    def abort(self):
+        """Discard the staging file without loading it (close() may already have removed it)"""
+        self.staging_file.close()
+        if os.path.exists(self.staging_path):
+            os.remove(self.staging_path)
+    
+    def close(self):
+        """Load the staging file and move rows into properties; raises if the load failed"""
+        self.staging_file.close()
+        self.timings['transform_and_stage'] = time.perf_counter() - self.started
+        cursor = self.conn.cursor()
+        columns = ', '.join(INSERT_COLUMNS)
+        staged_columns = f"{columns}, id" if self.new_id else columns
+        id_expression = 'id' if self.new_id else 'UUID()'
+        
+        try:
+            phase_start = time.perf_counter()
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}")
+            cursor.execute(f"CREATE TEMPORARY TABLE {STAGING_TABLE} SELECT {staged_columns} FROM properties LIMIT 0")
+            cursor.execute(f"""
+                LOAD DATA LOCAL INFILE %s
+                INTO TABLE {STAGING_TABLE}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                LINES TERMINATED BY '\\n'
+                ({staged_columns})
+            """, (self.staging_path,))
+            self.timings['load_data'] = time.perf_counter() - phase_start
+            print(f"  Loaded {self.staged} rows into {STAGING_TABLE}")
+            
+            # Foreign keys stay checked: a bad lookup, company or user id fails the load as it would a batch.
+            # unique_checks stays on as well, since property_number is the only guard against other tenants' rows
+            phase_start = time.perf_counter()
+            cursor.execute(f"""
+                INSERT INTO properties (id, {columns})
+                SELECT {id_expression}, {columns} FROM {STAGING_TABLE}
+            """)
+            self.imported = cursor.rowcount
+            self.timings['insert_select'] = time.perf_counter() - phase_start
+            
+            # Every staged row went in, so the summary counts come from one GROUP BY over the staging table
+            if self.aggregates:
+                phase_start = time.perf_counter()
+                self.aggregates.flush_table(cursor, STAGING_TABLE)
+                self.timings['aggregates'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
+            self.conn.commit()
+            self.timings['commit'] = time.perf_counter() - phase_start
+            self.metrics.count('imported', self.imported)
+        except Exception as e:
+            print(f"  ❌ Bulk load failed: {e}")
+            self.failed = self.staged
+            self.metrics.reject(f"bulk_load_error:{type(e).__name__}", self.staged)
+            self.conn.rollback()
+            raise
+        finally:
+            try:
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}")
+            except Exception as e:
+                # Must not hide the load's own error; the table goes away with the session anyway
+                print(f"  ⚠️  Could not drop {STAGING_TABLE}: {e}")
+            cursor.close()
+            os.remove(self.staging_path)
+        
+        print("\n⏱️  Bulk load phases:")
+        for phase, seconds in self.timings.items():
+            print(f"  {phase}: {seconds:.2f}s")
+            self.metrics.observe(f"bulk_{phase}", seconds)
+
+def encode_artifact_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat(' ')
+    return value
+
+class ArtifactWriter:
+    """Writes transformed rows to a gzip NDJSON artifact instead of the database
+    
+    Line 1 is a header (tenant, columns, mappings fingerprint), each row is a
+    JSON array in INSERT_COLUMNS order, and the last line is a trailer with
+    the row count so a truncated artifact is detected on load.
+    """
+    
+    def __init__(self, path, mappings, metrics=None):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.metrics = metrics or ImportMetrics()
+        self.imported = 0
+        self.failed = 0
+        self.failed_numbers = set()
+        self.file = gzip.open(self.tmp_path, 'wt', encoding='utf-8', compresslevel=ARTIFACT_COMPRESSION_LEVEL)
+        self._write_line({
+            'format': ARTIFACT_FORMAT,
+            'version': ARTIFACT_VERSION,
+            'tenant_id': TENANT_ID,
+            'created_by_id': USER_ID,
+            'columns': INSERT_COLUMNS,
+            'mappings_fingerprint': mappings_fingerprint(mappings),
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        })
+    
+    def _write_line(self, data):
+        self.file.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n')
+    
+    def add(self, property_data, position=None):
+        self._write_line([encode_artifact_value(property_data[col]) for col in INSERT_COLUMNS])
+        self.imported += 1
+    
+    def flush(self):
+        """Rows are streamed straight to the compressed file"""
+    
+    def close(self):
+        """Write the trailer and move the finished artifact into place"""
+        self._write_line({'row_count': self.imported})
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        self.metrics.count('artifact_rows', self.imported)
+
+class ArtifactReader:
+    """Streams property_data dicts back out of an ArtifactWriter artifact"""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            self.header = json.loads(f.readline())
+        
+        if self.header.get('format') != ARTIFACT_FORMAT or self.header.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"{path} is not a version {ARTIFACT_VERSION} property import artifact")
+        if self.header['tenant_id'] != TENANT_ID:
+            raise ValueError(f"Artifact {path} is for tenant {self.header['tenant_id']}, not {TENANT_ID}")
+        if tuple(self.header['columns']) != INSERT_COLUMNS:
+            raise ValueError(f"Artifact {path} was written with different columns")
+    
+    def __iter__(self):
+        decimal_indexes = [INSERT_COLUMNS.index(col) for col in DECIMAL_COLUMNS]
+        datetime_indexes = [INSERT_COLUMNS.index(col) for col in DATETIME_COLUMNS]
+        row_count = 0
+        
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                values = json.loads(line)
+                if isinstance(values, dict):
+                    if values.get('row_count') != row_count:
+                        raise ValueError(f"Artifact {self.path} trailer expects {values.get('row_count')} rows, read {row_count}")
+                    return
+                
+                for i in decimal_indexes:
+                    if values[i] is not None:
+                        values[i] = Decimal(values[i])
+                for i in datetime_indexes:
+                    if values[i] is not None:
+                        values[i] = datetime.fromisoformat(values[i])
+                row_count += 1
+                yield dict(zip(INSERT_COLUMNS, values))
+        
+        raise ValueError(f"Artifact {self.path} is truncated (no trailer after {row_count} rows)")
+
+_FLUSH = object()
+_DONE = object()
+
+class ThreadedWriter:
+    """Runs a writer on a background thread fed through a bounded queue"""
+    
+    def __init__(self, writer, queue_size=DEFAULT_QUEUE_SIZE):
+        self.writer = writer
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name='property-writer', daemon=True)
+        self.thread.start()
+    
+    @property
+    def imported(self):
+        return self.writer.imported
+    
+    @property
+    def failed(self):
+        return self.writer.failed
+    
+    @property
+    def failed_numbers(self):
+        return self.writer.failed_numbers
+    
+    def _run(self):
+        """Writer loop; keeps draining after an error so producers never block"""
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+            if self.error:
+                continue
+            
+            started = time.perf_counter()
+            try:
+                if item is _FLUSH:
+                    self.writer.flush()
+                else:
+                    self.writer.add(*item)
+            except BaseException as e:
+                self.error = e
+            self.busy_seconds += time.perf_counter() - started
+    
+    def _put(self, item):
+        if self.error:
+            raise self.error
+        
+        # A full queue means the writer is the bottleneck; record the wait
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            started = time.perf_counter()
+            self.queue.put(item)
+            self.blocked_seconds += time.perf_counter() - started
+    
+    def add(self, property_data, position=None):
+        """Queue a row for the writer thread"""
+        self._put((property_data, position))
+    
+    def flush(self):
+        """Ask the writer thread to flush once it reaches this point"""
+        self._put(_FLUSH)
+    
+    def close(self):
+        """Wait for queued rows to be written, then close the writer"""
+        self.queue.put(_DONE)
+        self.thread.join()
+        if self.error:
+            raise self.error
+        self.writer.close()
+        print(f"  Writer busy: {self.busy_seconds:.2f}s, transform waited on writer: {self.blocked_seconds:.2f}s")
+    
+    def abort(self):
+        """Stop the writer thread (queued rows are dropped), then abort the writer"""
+        self.error = self.error or RuntimeError('Writer aborted')
+        self.queue.put(_DONE)
+        self.thread.join()
+        self.writer.abort()
+
+ReadPosition = namedtuple('ReadPosition', 'file offset row_number processed skipped')
+
+class ImportCheckpoint:
+    """Durable record of the last committed batch, used by --resume
+    
+    Each flush first writes a pending entry (the batch's position and
+    property numbers), then commits, then promotes it to committed. On
+    resume a leftover pending entry is resolved against the database.
+    
+    Only the position and counters are kept, so every write is a few
+    hundred bytes; rows committed before the crash are skipped on resume
+    because the dedupe index is checked against the database.
+    """
+    
+    def __init__(self, path, csv_files, state=None, pending=None):
+        self.path = Path(path)
+        self.csv_files = list(csv_files)
+        self.state = dict(state) if state else None
+        self.pending = pending
+    
+    @classmethod
+    def load(cls, path, csv_files):
+        """Read a checkpoint written by an earlier run"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        if data['tenant_id'] != TENANT_ID or data['csv_files'] != list(csv_files):
+            raise ValueError(f"Checkpoint {path} was written for a different tenant or file list")
+        
+        return cls(path, csv_files, data['committed'], data['pending'])
+    
+    def resolve_pending(self, conn):
+        """Decide whether a batch that was in flight at crash time was committed"""
+        if not self.pending:
+            return
+        
+        batch_numbers = self.pending['batch_numbers']
+        cursor = conn.cursor()
+        placeholders = ', '.join(['%s'] * len(batch_numbers))
+        cursor.execute(
+            f"SELECT COUNT(*) FROM properties WHERE company_id = %s AND property_number IN ({placeholders})",
+            (TENANT_ID, *batch_numbers)
+        )
+        (found,) = cursor.fetchone()
+        cursor.close()
+        
+        # The batch commits or rolls back as a whole; only failed rows are missing
+        if found:
+            print(f"  Last in-flight batch was committed ({found} rows), resuming after it")
+            self.state = {k: v for k, v in self.pending.items() if k != 'batch_numbers'}
+        else:
+            print("  Last in-flight batch was not committed, resuming before it")
+        self.pending = None
+    
+    def prepare(self, position, batch_numbers, imported, failed):
+        """Record the batch about to be committed"""
+        self.pending = {
+            **position._asdict(),
+            'imported': imported,
+            'failed': failed,
+            'batch_numbers': batch_numbers
+        }
+        self._write()
+    
+    def commit(self):
+        """Promote the pending batch once the database commit succeeded"""
+        self.state = {k: v for k, v in self.pending.items() if k != 'batch_numbers'}
+        self.pending = None
+        self._write()
+    
+    def clear(self):
+        """Remove the checkpoint after a completed import"""
+        if self.path.exists():
+            self.path.unlink()
+    
+    def _write(self):
+        """Write the checkpoint atomically (temp file, fsync, rename)"""
+        data = {
+            'tenant_id': TENANT_ID,
+            'csv_files': self.csv_files,
+            'committed': self.state,
+            'pending': self.pending
+        }
+        
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+class OffsetLineReader:
+    """Line iterator over a binary file that tracks the byte offset consumed"""
+    
+    def __init__(self, f, encoding='utf-8'):
+        self.f = f
+        self.encoding = encoding
+        self.offset = f.tell()
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        # Same newline handling as opening the file in text mode
+        return line.decode(self.encoding).replace('\r\n', '\n').replace('\r', '\n')
+    
+    def seek(self, offset):
+        self.f.seek(offset)
+        self.offset = offset
+
+class PropertyRecord:
+    """The fields of one CSV row the importer uses, resolved through a ColumnPlan"""
+    
+    __slots__ = ('values', 'plan') + tuple(RECORD_FIELDS)
+    
+    def __init__(self, values, plan, *fields):
+        self.values = values
+        self.plan = plan
+        for name, value in zip(RECORD_FIELDS, fields):
+            setattr(self, name, value)
+    
+    def __getstate__(self):
+        # Workers only transform the named fields; the raw values and plan stay in this process
+        return tuple(getattr(self, name) for name in RECORD_FIELDS)
+    
+    def __setstate__(self, state):
+        self.values = None
+        self.plan = None
+        for name, value in zip(RECORD_FIELDS, state):
+            setattr(self, name, value)
+
+class ColumnPlan:
+    """Fixed column indices for one CSV header
+    
+    Same results as csv.DictReader + row.get(): a missing column reads as
+    None, duplicate header names resolve to the last one, and a fallback
+    column is only consulted when the first choice is blank.
+    """
+    
+    MISSING = -1  # Rows get a trailing None, so index -1 reads as a missing column
+    
+    def __init__(self, fieldnames):
+        self.fieldnames = tuple(fieldnames)
+        self.width = len(self.fieldnames)
+        index = {name: i for i, name in enumerate(self.fieldnames)}
+        
+        primary = []
+        self.fallbacks = []
+        for position, columns in enumerate(RECORD_FIELDS.values()):
+            present = [index.get(col, self.MISSING) for col in columns]
+            primary.append(present[0])
+            if len(present) > 1:
+                # row.get(a) or row.get(b): with a absent this is just b
+                if present[0] == self.MISSING:
+                    primary[-1] = present[1]
+                else:
+                    self.fallbacks.append((position, present[1]))
+        
+        self.getter = itemgetter(*primary)
+        self.source_indices = tuple(index.get(col, self.MISSING) for col in SOURCE_COLUMNS)
+    
+    def record(self, values):
+        """Build a PropertyRecord from a csv.reader row"""
+        if len(values) < self.width:
+            values.extend([None] * (self.width - len(values)))
+        values.append(None)
+        
+        fields = self.getter(values)
+        if self.fallbacks:
+            fields = list(fields)
+            for position, index in self.fallbacks:
+                if not fields[position]:
+                    fields[position] = values[index]
+        return PropertyRecord(values, self, *fields)
+
+@lru_cache(maxsize=64)
+def column_plan(fieldnames):
+    """ColumnPlan for a header, compiled once per distinct header"""
+    return ColumnPlan(fieldnames)
+
+def iter_csv_rows(f, start_offset=0):
+    """Yield (PropertyRecord, end_offset) from a CSV opened in binary mode"""
+    lines = OffsetLineReader(f)
+    reader = csv.reader(lines)
+    
+    # Read the header before jumping to the resume position
+    fieldnames = next(reader, None)
+    if fieldnames is None:
+        return
+    plan = column_plan(tuple(fieldnames))
+    if start_offset:
+        lines.seek(start_offset)
+    
+    make_record = plan.record
+    for values in reader:
+        if values:  # csv.DictReader skips blank lines too
+            yield make_record(values), lines.offset
+
+def timed_rows(rows, metrics):
+    """Pass rows through, timing each read from the CSV"""
+    rows = iter(rows)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(rows)
+        except StopIteration:
+            return
+        metrics.observe('csv_read', time.perf_counter() - started)
+        yield item
+
+def hash_source_row(row):
+    """Content hash of the CSV fields the importer maps"""
+    values = row.values
+    content = '\x1f'.join(values[i] or '' for i in row.plan.source_indices)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+class DeltaState:
+    """Modified Time and content hash of imported rows, keyed by tenant and property number
+    
+    The state is only trusted while the lookup mappings are unchanged, so a
+    new region or type mapping makes every row count as changed again.
+    
+    Rows are recorded as each batch commits, by appending them to a journal
+    next to the state file; save() folds the journal into the state at the
+    end of the run. After a crash the next run replays the journal, so the
+    batches that did commit count as unchanged.
+    """
+    
+    def __init__(self, path, mappings, existing):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + '.journal')
+        self.journal = None
+        self.mappings_fingerprint = mappings_fingerprint(mappings)
+        self.tenants = {}
+        self.rows = {}
+        self.changed = {}
+        self.existing = existing
+        self.counts = {'unchanged': 0, 'updated': 0, 'new': 0}
+        
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.tenants = json.load(f)
+        
+        tenant_state = self.tenants.get(TENANT_ID)
+        if tenant_state and tenant_state['mappings_fingerprint'] == self.mappings_fingerprint:
+            self.rows = tenant_state['rows']
+        elif tenant_state:
+            print("  Lookup mappings changed since the last run, treating all rows as changed")
+        
+        if self.journal_path.exists():
+            replayed = 0
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn last line from a crash mid-write
+                    if entry['tenant_id'] == TENANT_ID and entry['mappings_fingerprint'] == self.mappings_fingerprint:
+                        self.rows.update(entry['rows'])
+                        replayed += len(entry['rows'])
+            print(f"  Replayed {replayed} rows committed by an interrupted run")
+    
+    def filter_changed(self, rows):
+        """Yield only new or changed rows, counting the unchanged ones"""
+        for row, prop_number, position in rows:
+            entry = [row.modified_time or '', hash_source_row(row)]
+            
+            if prop_number in self.existing and self.rows.get(prop_number) == entry:
+                self.counts['unchanged'] += 1
+                continue
+            
+            # Counted as new/updated only once committed, so rejected rows are not
+            self.changed[prop_number] = ('updated' if prop_number in self.existing else 'new', entry)
+            yield row, prop_number, position
+    
+    def record(self, prop_numbers):
+        """Journal the rows of a committed batch (called by the writer after each commit)"""
+        committed = {}
+        for prop_number in prop_numbers:
+            change = self.changed.pop(prop_number, None)
+            if change:
+                kind, committed[prop_number] = change
+                self.counts[kind] += 1
+        if not committed:
+            return
+        
+        self.rows.update(committed)
+        if self.journal is None:
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        self.journal.write(json.dumps({
+            'tenant_id': TENANT_ID,
+            'mappings_fingerprint': self.mappings_fingerprint,
+            'rows': committed
+        }, ensure_ascii=False) + '\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+    
+    def close(self):
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+    
+    def save(self):
+        """Fold the recorded rows into the state file (atomically) and drop the journal"""
+        self.close()
+        self.tenants[TENANT_ID] = {
+            'mappings_fingerprint': self.mappings_fingerprint,
+            'rows': self.rows
+        }
+        
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.tenants, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.journal_path.unlink(missing_ok=True)
+
+def iter_new_properties(rows, csv_file, property_numbers_seen, stats, row_number=0, metrics=None):
+    """Yield (row, property_number, position) for rows not skipped as blank or duplicate"""
+    for row, offset in rows:
+        stats['processed'] += 1
+        row_number += 1
+        
+        # Get property number
+        prop_number = (row.property_number or '').strip()
+        
+        if not prop_number:
+            stats['skipped'] += 1
+            if metrics:
+                metrics.reject('missing_property_number')
+            continue
+        
+        # Skip duplicates (first occurrence wins)
+        if prop_number in property_numbers_seen:
+            stats['skipped'] += 1
+            if metrics:
+                metrics.reject('duplicate_property_number')
+            continue
+        
+        property_numbers_seen.add(prop_number)
+        yield row, prop_number, ReadPosition(csv_file, offset, row_number, stats['processed'], stats['skipped'])
+
+def iter_chunks(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def build_property_chunk(chunk, lookups, columnar=False):
+    """Transform a list of (row, property_number, position) items"""
+    if not columnar:
+        return [
+            (build_property_data(row, prop_number, lookups), position)
+            for row, prop_number, position in chunk
+        ]
+    
+    started = time.perf_counter()
+    columns = parse_numeric_columns([row for row, _, _ in chunk])
+    if lookups.metrics:
+        lookups.metrics.observe('columnar_parse', time.perf_counter() - started)
+    numeric = zip(columns['total_price'], columns['currency_code'], columns['land_area'], columns['rooms_count'])
+    return [
+        (build_property_data(row, prop_number, lookups, fields), position)
+        for (row, prop_number, position), fields in zip(chunk, numeric)
+    ]
+
+_worker_lookups = None
+_worker_columnar = False
+
+def _init_transform_worker(mappings, now, columnar=False, instrument=False):
+    """Compile the lookup resolvers once per worker process"""
+    global _worker_lookups, _worker_columnar, _run_now
+    _worker_lookups = PropertyLookups(mappings)
+    _worker_lookups.metrics = ImportMetrics() if instrument else None
+    _worker_columnar = columnar
+    _run_now = now
+
+def _transform_chunk(chunk):
+    """Transform a chunk of (row, property_number, position) items in a worker"""
+    items = build_property_chunk(chunk, _worker_lookups, _worker_columnar)
+    metrics = _worker_lookups.metrics.take() if _worker_lookups.metrics else None
+    return items, _worker_lookups.take_stats(), metrics
+
+def transform_rows(rows, lookups, executor=None, chunk_size=DEFAULT_CHUNK_SIZE, max_pending=2, columnar=False):
+    """Yield (property_data, position) in input order, using worker processes if given an executor"""
+    if executor is None and columnar:
+        for chunk in iter_chunks(rows, chunk_size):
+            yield from build_property_chunk(chunk, lookups, columnar=True)
+        return
+    
+    if executor is None:
+        for row, prop_number, position in rows:
+            yield build_property_data(row, prop_number, lookups), position
+        return
+    
+    def collect(future):
+        items, stats, metrics = future.result()
+        lookups.merge_stats(stats)
+        if metrics and lookups.metrics:
+            lookups.metrics.merge(metrics)
+        return items
+    
+    # Keep a bounded number of chunks in flight and collect them in order
+    pending = deque()
+    for chunk in iter_chunks(rows, chunk_size):
+        pending.append(executor.submit(_transform_chunk, chunk))
+        if len(pending) >= max_pending:
+            yield from collect(pending.popleft())
+    
+    while pending:
+        yield from collect(pending.popleft())
+
+def save_dedupe_index(dedupe_index, writer):
+    """Persist the run's property numbers, leaving out the ones the database refused
+    
+    Only called after the writer closed cleanly; a failed run (e.g. a bulk
+    load that rolled back) keeps the previous index on disk.
+    """
+    dedupe_index.discard(writer.failed_numbers)
+    dedupe_index.save()
+    dedupe_index.close()
+
+def import_properties(batch_size=DEFAULT_BATCH_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES, bulk_load=False,
+                      workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, queue_size=DEFAULT_QUEUE_SIZE,
+                      checkpoint_path=None, resume=False, incremental=False, state_path=None, index_dir=None,
+                      columnar=False, metrics_file=None, metrics_interval=DEFAULT_EMIT_INTERVAL,
+                      prometheus_textfile=None, profile_path=None, profile_rows=0, rejects_path=None,
+                      id_strategy=DEFAULT_ID_STRATEGY, index_window=False, read_buffer=DEFAULT_READ_BUFFER,
+                      maintain_aggregates=False):
     """Main import function"""
     
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    started = time.perf_counter()
+    metrics = ImportMetrics(metrics_file, metrics_interval, prometheus_textfile)
+    profiler = ImportProfiler(profile_path, profile_rows) if profile_path else None
+    # Per-row stage timings cost a few clock reads per row; only take them when something records them
+    timed = bool(metrics_file or prometheus_textfile or profile_path)
+    conn = get_connection()
     
     # Load mappings
     print("Loading lookup table mappings...")
@@ -246,136 +1610,167 @@ def import_properties():
     print(f"  Finishing: {len(mappings['finishing'])}")
     print(f"  Regions: {len(mappings['regions'])}")
     print(f"  Currencies: {len(mappings['currencies'])}")
+    lookups = PropertyLookups(mappings)
+    if timed:
+        lookups.metrics = metrics
     
-    # CSV files to process
-    csv_files = [
-        'property_data_1.csv',
-        'property_data_2.csv'
-    ]
+    csv_files = list(CSV_FILES)
+    migrations_dir = Path(__file__).parent
+    checkpoint_path = checkpoint_path or migrations_dir / DEFAULT_CHECKPOINT_FILE
     
-    if not SKIP_FILE_3:
-        csv_files.append('property_data_3.csv')
+    # Property numbers already imported for this tenant, in one streaming query
+    dedupe_index = PropertyNumberIndex.preload(conn, TENANT_ID, index_dir or migrations_dir / DEFAULT_INDEX_DIR)
+    existing_count = len(dedupe_index)
+    print(f"  Existing properties: {existing_count}")
+    aggregates = None
+    if maintain_aggregates:
+        prepare_aggregates(conn, TENANT_ID, existing_count)
+        aggregates = AggregateDeltas(TENANT_ID, INSERT_COLUMNS)
     
-    migrations_dir = Path(__file__).parent
+    # Incremental runs update existing rows, so they only dedupe within the run
+    stats = {'processed': 0, 'skipped': 0}
+    property_numbers_seen = set() if incremental else dedupe_index
+    resume_position = None
+    checkpoint = None
     
-    total_processed = 0
-    total_imported = 0
-    total_skipped = 0
-    property_numbers_seen = set()
+    # Bulk loads commit once at the end, so only batched inserts checkpoint
+    if resume:
+        checkpoint = ImportCheckpoint.load(checkpoint_path, csv_files)
+        checkpoint.resolve_pending(conn)
+        if checkpoint.state:
+            resume_position = ReadPosition(**{f: checkpoint.state[f] for f in ReadPosition._fields})
+            stats = {'processed': resume_position.processed, 'skipped': resume_position.skipped}
+            print(f"Resuming {resume_position.file} after row {resume_position.row_number} "
+                  f"(byte {resume_position.offset}, {checkpoint.state['imported']} imported so far)")
+    elif not bulk_load:
+        if Path(checkpoint_path).exists():
+            print(f"⚠️  Replacing existing checkpoint {checkpoint_path} (use --resume to continue it)")
+        checkpoint = ImportCheckpoint(checkpoint_path, csv_files)
     
-    for csv_file in csv_files:
-        filepath = migrations_dir / csv_file
-        
-        if not filepath.exists():
-            print(f"⚠️  File not found: {csv_file}")
-            continue
-        
-        print(f"\n{'='*60}")
-        print(f"Processing: {csv_file}")
-        print(f"{'='*60}")
+    delta = None
+    if incremental:
+        delta = DeltaState(state_path or migrations_dir / DEFAULT_DELTA_STATE_FILE, mappings, dedupe_index)
+    
+    # An earlier --index-window run that died mid-load left indexes and foreign keys dropped
+    IndexWindow.recover(conn)
+    window = None
+    if index_window:
+        window = IndexWindow(conn, metrics=metrics)
+        window.open()
+    
+    # Writes go through their own pooled connection so the writer thread never shares one
+    write_conn = get_connection(allow_local_infile=True) if bulk_load else get_connection()
+    rejects = RejectsWriter(rejects_path or migrations_dir / DEFAULT_REJECTS_FILE, append=resume)
+    if bulk_load:
+        writer = BulkLoadWriter(write_conn, metrics, id_generator(id_strategy), aggregates)
+    else:
+        writer = PropertyBatchWriter(write_conn, batch_size, max_batch_bytes, checkpoint, upsert=incremental,
+                                     metrics=metrics, rejects=rejects, new_id=id_generator(id_strategy),
+                                     aggregates=aggregates, delta=delta)
+    
+    # Write on a separate thread so parsing and DB round-trips overlap
+    if queue_size > 0:
+        writer = ThreadedWriter(writer, queue_size)
+    
+    executor = None
+    if workers > 1:
+        print(f"Transforming with {workers} worker processes ({chunk_size} rows per chunk)")
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_transform_worker,
+            initargs=(mappings, run_now(), columnar, timed)
+        )
+    
+    try:
+        if profiler:
+            profiler.start()
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        for csv_file in csv_files:
+            filepath = resolve_csv_path(migrations_dir, csv_file)
+            start_offset = 0
+            start_row = 0
             
-            for row in reader:
-                total_processed += 1
-                
-                # Get property number
-                prop_number = row.get('Property Number', '').strip()
-                
-                if not prop_number:
-                    total_skipped += 1
+            # Files before the checkpoint were fully committed
+            if resume_position:
+                if csv_file != resume_position.file:
+                    print(f"⏭️  Already imported: {csv_file}")
                     continue
+                start_offset = resume_position.offset
+                start_row = resume_position.row_number
+                resume_position = None
+            
+            if not filepath.exists():
+                print(f"⚠️  File not found: {csv_file}")
+                continue
+            
+            print(f"\n{'='*60}")
+            print(f"Processing: {filepath.name}")
+            print(f"{'='*60}")
+            
+            # Checkpoint offsets are positions in the decompressed stream, whatever the file's compression
+            with CsvSource(filepath, read_buffer) as source:
+                progress = ProgressReporter(source)
+                rows = iter_csv_rows(source.stream, start_offset)
+                if timed:
+                    rows = timed_rows(rows, metrics)
+                rows = iter_new_properties(rows, csv_file, property_numbers_seen, stats, start_row, metrics)
+                if delta:
+                    rows = delta.filter_changed(rows)
                 
-                # Skip duplicates
-                if prop_number in property_numbers_seen:
-                    total_skipped += 1
-                    continue
-                
-                property_numbers_seen.add(prop_number)
-                
-                # Parse data
-                type_id = map_property_type(row.get('Type'), mappings)
-                status_id = map_property_status(row.get('Unit For'), mappings)
-                finishing_id = map_finishing_status(row.get('Finished'), mappings)
-                region_id = map_region(row.get('Area'), mappings)
-                
-                total_price = parse_price(row.get('Total Price'))
-                currency_code = detect_currency(row.get('Total Price'), total_price)
-                currency_id = mappings['currencies'].get(currency_code)
-                
-                land_area = parse_price(row.get('Land area') or row.get('SPACE'))
-                rooms_count = parse_rooms(row.get('ROOMS'))
-                
-                created_at = parse_date(row.get('Created Time')) or datetime.now()
-                updated_at = parse_date(row.get('Modified Time')) or datetime.now()
-                
-                # Prepare property data
-                property_data = {
-                    'id': None,  # UUID will be generated by database
-                    'company_id': TENANT_ID,
-                    'created_by_id': USER_ID,
-                    'property_number': prop_number,
-                    'type_id': type_id,
-                    'status_id': status_id,
-                    'finishing_status_id': finishing_id,
-                    'region_id': region_id,
-                    'property_name': (row.get('Property Name - Compound Name') or '')[:500],
-                    'title': f"Property {prop_number}",
-                    'description': (row.get('Description') or '')[:2000],
-                    'land_area': land_area,
-                    'total_area': land_area,
-                    'rooms_count': rooms_count,
-                    'bedrooms_count': rooms_count,
-                    'sale_price': total_price if status_id == mappings['statuses'].get('FOR_SALE') else None,
-                    'rental_price_monthly': total_price if status_id == mappings['statuses'].get('FOR_RENT') else None,
-                    'currency_id': currency_id,
-                    'building_name': (row.get('Building') or row.get('BUILDING NAME') or '')[:255],
-                    'unit_number': (row.get('Unit NO') or '')[:50],
-                    'floor_number': (row.get('The Floors') or '')[:100],
-                    'created_at': created_at,
-                    'updated_at': updated_at
-                }
-                
-                # Insert property
-                try:
-                    insert_sql = """
-                        INSERT INTO properties (
-                            id, company_id, created_by_id, property_number,
-                            type_id, status_id, finishing_status_id, region_id,
-                            property_name, title, description,
-                            land_area, total_area, rooms_count, bedrooms_count,
-                            sale_price, rental_price_monthly, currency_id,
-                            building_name, unit_number, floor_number,
-                            created_at, updated_at
-                        ) VALUES (
-                            UUID(), %(company_id)s, %(created_by_id)s, %(property_number)s,
-                            %(type_id)s, %(status_id)s, %(finishing_status_id)s, %(region_id)s,
-                            %(property_name)s, %(title)s, %(description)s,
-                            %(land_area)s, %(total_area)s, %(rooms_count)s, %(bedrooms_count)s,
-                            %(sale_price)s, %(rental_price_monthly)s, %(currency_id)s,
-                            %(building_name)s, %(unit_number)s, %(floor_number)s,
-                            %(created_at)s, %(updated_at)s
-                        )
-                    """
-                    
-                    cursor.execute(insert_sql, property_data)
-                    total_imported += 1
-                    
-                    if total_imported % 100 == 0:
-                        print(f"  Imported {total_imported} properties...")
-                        conn.commit()
-                    
-                except Exception as e:
-                    print(f"  ❌ Error importing {prop_number}: {e}")
-                    total_skipped += 1
-        
-        conn.commit()
-        print(f"✅ Completed {csv_file}")
-    
-    cursor.close()
+                transformed = transform_rows(rows, lookups, executor, chunk_size, workers * 2, columnar)
+                for property_data, position in transformed:
+                    writer.add(property_data, position)
+                    metrics.maybe_emit()
+                    progress.maybe_report(stats['processed'])
+                    if profiler:
+                        profiler.tick()
+                progress.report(stats['processed'])
+            
+            writer.flush()
+            print(f"✅ Completed {csv_file}")
+        
+        writer.close()
+        if profiler:
+            profiler.stop()
+    except BaseException:
+        # Roll back the writer first so the window's ALTER TABLE is not left waiting on its locks
+        writer.abort()
+        if delta:
+            delta.close()
+        raise
+    finally:
+        # After a failure queued chunks are dropped, so the worker processes exit with this one
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        if window:
+            window.restore()
+    if window:
+        window.verify()
+    write_conn.close()
     conn.close()
     
+    if checkpoint:
+        checkpoint.clear()
+    if delta:
+        delta.save()
+    save_dedupe_index(dedupe_index, writer)
+    
+    total_processed = stats['processed']
+    total_imported = writer.imported
+    total_skipped = stats['skipped'] + writer.failed
+    elapsed = time.perf_counter() - started
+    
+    metrics.count('processed', total_processed)
+    for resolver in lookups.resolvers.values():
+        metrics.count(f"lookup_resolved:{resolver.name}", resolver.resolved)
+        metrics.count(f"lookup_unmapped:{resolver.name}", sum(resolver.unmapped.values()))
+        hits, misses = resolver.cache_info()
+        metrics.count(f"lookup_cache_hit:{resolver.name}", hits)
+        metrics.count(f"lookup_cache_miss:{resolver.name}", misses)
+    if delta:
+        metrics.count('unchanged', delta.counts['unchanged'])
+    metrics.emit()
+    
     # Print summary
     print(f"\n{'='*60}")
     print("📊 IMPORT SUMMARY")
@@ -383,15 +1778,276 @@ def import_properties():
     print(f"Total rows processed: {total_processed}")
     print(f"✅ Successfully imported: {total_imported}")
     print(f"⚠️  Skipped (duplicates/errors): {total_skipped}")
-    print(f"Unique properties: {len(property_numbers_seen)}")
+    print(f"Unique properties: {len(property_numbers_seen) - (0 if incremental else existing_count)}")
+    print(f"Already in database before this run: {existing_count}")
+    if delta:
+        print(f"🔁 Incremental: {delta.counts['new']} new, {delta.counts['updated']} updated, "
+              f"{delta.counts['unchanged']} unchanged")
+    if rejects.count:
+        print(f"🧾 Rows refused by the database: {rejects.count} (see {rejects.path})")
+    if aggregates and aggregates.groups_written:
+        print(f"📈 {AGGREGATES_TABLE}: {aggregates.groups_written} group counts updated")
+    print(f"⏱️  Elapsed: {elapsed:.2f}s ({total_imported / elapsed if elapsed else 0:.0f} rows/sec)")
+    lookups.print_report()
+    metrics.print_report()
+    if window:
+        window.print_report()
+
+def transform_to_artifact(artifact_path, mappings_path, workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE,
+                          columnar=False, read_buffer=DEFAULT_READ_BUFFER):
+    """Transform the CSV files into an artifact using a mappings snapshot (no database access)"""
+    started = time.perf_counter()
+    metrics = ImportMetrics()
+    mappings = load_mappings_snapshot(mappings_path)
+    print(f"Loaded lookup mappings snapshot from {mappings_path}")
+    lookups = PropertyLookups(mappings)
+    
+    migrations_dir = Path(__file__).parent
+    stats = {'processed': 0, 'skipped': 0}
+    property_numbers_seen = set()  # Rows already in the database are skipped at load time
+    writer = ArtifactWriter(artifact_path, mappings, metrics)
+    
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_transform_worker,
+            initargs=(mappings, run_now(), columnar, False)
+        )
+    
+    try:
+        for csv_file in CSV_FILES:
+            filepath = resolve_csv_path(migrations_dir, csv_file)
+            if not filepath.exists():
+                print(f"⚠️  File not found: {csv_file}")
+                continue
+            
+            print(f"Transforming: {filepath.name}")
+            with CsvSource(filepath, read_buffer) as source:
+                progress = ProgressReporter(source)
+                rows = iter_csv_rows(source.stream)
+                rows = iter_new_properties(rows, csv_file, property_numbers_seen, stats, metrics=metrics)
+                transformed = transform_rows(rows, lookups, executor, chunk_size, workers * 2, columnar)
+                for property_data, position in transformed:
+                    writer.add(property_data, position)
+                    progress.maybe_report(stats['processed'])
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    writer.close()
+    elapsed = time.perf_counter() - started
+    
+    print(f"\n{'='*60}")
+    print("📦 TRANSFORM SUMMARY")
+    print(f"{'='*60}")
+    print(f"Total rows processed: {stats['processed']}")
+    print(f"Rows written to artifact: {writer.imported}")
+    print(f"⚠️  Skipped (blank/duplicate): {stats['skipped']}")
+    print(f"Artifact: {artifact_path} ({Path(artifact_path).stat().st_size / 1024:.0f} KiB)")
+    print(f"⏱️  Elapsed: {elapsed:.2f}s ({writer.imported / elapsed if elapsed else 0:.0f} rows/sec)")
+    lookups.print_report()
+    metrics.print_report()
+
+def load_artifact(artifact_path, batch_size=DEFAULT_BATCH_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                  bulk_load=False, queue_size=DEFAULT_QUEUE_SIZE, index_dir=None, rejects_path=None,
+                  id_strategy=DEFAULT_ID_STRATEGY, index_window=False, maintain_aggregates=False):
+    """Stream a transform artifact into the batched or bulk insert path"""
+    started = time.perf_counter()
+    metrics = ImportMetrics()
+    reader = ArtifactReader(artifact_path)
+    conn = get_connection()
+    
+    # Lookup IDs in the artifact are only valid against the mappings they were resolved from
+    current_fingerprint = mappings_fingerprint(load_lookup_mappings(conn))
+    if current_fingerprint != reader.header['mappings_fingerprint']:
+        conn.close()
+        raise ValueError("Lookup tables changed since the artifact was transformed; "
+                         "save a new mappings snapshot and transform again")
+    
+    migrations_dir = Path(__file__).parent
+    dedupe_index = PropertyNumberIndex.preload(conn, TENANT_ID, index_dir or migrations_dir / DEFAULT_INDEX_DIR)
+    existing_count = len(dedupe_index)
+    print(f"  Existing properties: {existing_count}")
+    aggregates = None
+    if maintain_aggregates:
+        prepare_aggregates(conn, TENANT_ID, existing_count)
+        aggregates = AggregateDeltas(TENANT_ID, INSERT_COLUMNS)
+    
+    IndexWindow.recover(conn)
+    window = None
+    if index_window:
+        window = IndexWindow(conn, metrics=metrics)
+        window.open()
+    
+    write_conn = get_connection(allow_local_infile=True) if bulk_load else get_connection()
+    rejects = RejectsWriter(rejects_path or migrations_dir / DEFAULT_REJECTS_FILE)
+    if bulk_load:
+        writer = BulkLoadWriter(write_conn, metrics, id_generator(id_strategy), aggregates)
+    else:
+        writer = PropertyBatchWriter(write_conn, batch_size, max_batch_bytes, metrics=metrics, rejects=rejects,
+                                     new_id=id_generator(id_strategy), aggregates=aggregates)
+    if queue_size > 0:
+        writer = ThreadedWriter(writer, queue_size)
+    
+    read = 0
+    skipped = 0
+    try:
+        for property_data in reader:
+            read += 1
+            prop_number = property_data['property_number']
+            if prop_number in dedupe_index:
+                skipped += 1
+                metrics.reject('duplicate_property_number')
+                continue
+            dedupe_index.add(prop_number)
+            writer.add(property_data)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if window:
+            window.restore()
+    if window:
+        window.verify()
+    write_conn.close()
+    conn.close()
+    save_dedupe_index(dedupe_index, writer)
+    elapsed = time.perf_counter() - started
+    
+    print(f"\n{'='*60}")
+    print("📊 ARTIFACT LOAD SUMMARY")
+    print(f"{'='*60}")
+    print(f"Rows in artifact: {read}")
+    print(f"✅ Successfully imported: {writer.imported}")
+    print(f"⚠️  Skipped (already in database/errors): {skipped + writer.failed}")
+    if rejects.count:
+        print(f"🧾 Rows refused by the database: {rejects.count} (see {rejects.path})")
+    if aggregates and aggregates.groups_written:
+        print(f"📈 {AGGREGATES_TABLE}: {aggregates.groups_written} group counts updated")
+    print(f"⏱️  Elapsed: {elapsed:.2f}s ({writer.imported / elapsed if elapsed else 0:.0f} rows/sec)")
+    metrics.print_report()
+    if window:
+        window.print_report()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import property CSV files')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='rows per multi-row INSERT')
+    parser.add_argument('--max-batch-bytes', type=int, default=DEFAULT_MAX_BATCH_BYTES,
+                        help='approximate statement size ceiling per batch')
+    parser.add_argument('--bulk-load', action='store_true',
+                        help='stage rows in a TSV file and load them with LOAD DATA LOCAL INFILE')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='processes used to transform rows (1 = no pool)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='rows per chunk sent to a worker process')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='rows buffered for the writer thread (0 = write inline)')
+    parser.add_argument('--checkpoint', default=None,
+                        help=f'checkpoint file (default: {DEFAULT_CHECKPOINT_FILE} next to this script)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the last committed batch in the checkpoint')
+    parser.add_argument('--incremental', action='store_true',
+                        help='skip rows unchanged since the last run and upsert the rest')
+    parser.add_argument('--state', default=None,
+                        help=f'incremental state file (default: {DEFAULT_DELTA_STATE_FILE} next to this script)')
+    parser.add_argument('--dedupe-index', default=None,
+                        help=f'directory for per-tenant property number indexes (default: {DEFAULT_INDEX_DIR})')
+    parser.add_argument('--columnar', action='store_true',
+                        help='parse price, area and room fields per chunk (columnar_parse.py)')
+    parser.add_argument('--metrics-file', default=None,
+                        help="append a JSON metrics line every --metrics-interval seconds ('-' = stderr)")
+    parser.add_argument('--metrics-interval', type=float, default=DEFAULT_EMIT_INTERVAL,
+                        help='seconds between metrics emissions')
+    parser.add_argument('--prometheus-textfile', default=None,
+                        help='rewrite this Prometheus textfile (node_exporter textfile collector) with each emission')
+    parser.add_argument('--profile', default=None,
+                        help='write cProfile stats of the main thread to this file')
+    parser.add_argument('--profile-rows', type=int, default=0,
+                        help='stop profiling after this many rows (0 = whole run)')
+    parser.add_argument('--save-mappings', default=None, metavar='PATH',
+                        help='write a snapshot of the lookup mappings for --transform-only and exit')
+    parser.add_argument('--transform-only', default=None, metavar='ARTIFACT',
+                        help='transform the CSVs into a gzip NDJSON artifact without database access')
+    parser.add_argument('--mappings', default=None, metavar='PATH',
+                        help='mappings snapshot used by --transform-only')
+    parser.add_argument('--from-artifact', default=None, metavar='ARTIFACT',
+                        help='load a --transform-only artifact instead of parsing the CSVs')
+    parser.add_argument('--rejects-file', default=None,
+                        help=f'CSV of rows the database refused (default: {DEFAULT_REJECTS_FILE} next to this script)')
+    parser.add_argument('--index-window', action='store_true',
+                        help='drop secondary indexes and foreign keys on properties for the load, rebuild them '
+                             'afterwards and verify integrity (large initial loads with no other writers)')
+    parser.add_argument('--aggregates', action='store_true',
+                        help=f'keep {AGGREGATES_TABLE} current as batches commit (see property_aggregates.py)')
+    parser.add_argument('--id-strategy', choices=ID_STRATEGIES, default=DEFAULT_ID_STRATEGY,
+                        help="primary keys: the database's UUID(), or time-ordered UUIDv7 generated here")
+    parser.add_argument('--read-buffer', type=parse_size, default=DEFAULT_READ_BUFFER,
+                        help='read buffer for the CSV files and their decompressed stream, e.g. 256k, 4M')
+    args = parser.parse_args()
+    
+    if args.resume and args.bulk_load:
+        parser.error('--resume is only supported for batched inserts')
+    if args.resume and args.incremental:
+        parser.error('--resume does not apply to --incremental; rerun --incremental, it skips rows already committed')
+    if args.incremental and args.bulk_load:
+        parser.error('--incremental is only supported for batched inserts')
+    if args.transform_only and not args.mappings:
+        parser.error('--transform-only needs a --mappings snapshot')
+    if (args.transform_only or args.from_artifact) and (args.resume or args.incremental):
+        parser.error('--resume and --incremental do not apply to artifacts')
+    
+    if args.save_mappings:
+        conn = get_connection()
+        save_mappings_snapshot(args.save_mappings, load_lookup_mappings(conn))
+        conn.close()
+        print(f"💾 Lookup mappings saved to: {args.save_mappings}")
+        raise SystemExit(0)
+    
+    if args.transform_only:
+        transform_to_artifact(args.transform_only, args.mappings, args.workers, args.chunk_size, args.columnar,
+                              args.read_buffer)
+        raise SystemExit(0)
+    
+    if args.from_artifact:
+        load_artifact(args.from_artifact, args.batch_size, args.max_batch_bytes, args.bulk_load,
+                      args.queue_size, args.dedupe_index, args.rejects_file, args.id_strategy, args.index_window,
+                      args.aggregates)
+        raise SystemExit(0)
+    
     print("="*60)
     print("🚀 PROPERTY CSV IMPORTER")
     print("="*60)
     print(f"Tenant: {TENANT_ID}")
     print(f"User: {USER_ID}")
-    print(f"Skip File 3: {SKIP_FILE_3}")
+    print(f"Mode: {'bulk load' if args.bulk_load else f'batched inserts ({args.batch_size} rows)'}")
+    print(f"Workers: {args.workers}")
+    print(f"IDs: {args.id_strategy}")
+    print(f"Incremental: {args.incremental}")
     print("="*60)
     
-    import_properties()
+    import_properties(
+        batch_size=args.batch_size,
+        max_batch_bytes=args.max_batch_bytes,
+        bulk_load=args.bulk_load,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        queue_size=args.queue_size,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        incremental=args.incremental,
+        state_path=args.state,
+        index_dir=args.dedupe_index,
+        columnar=args.columnar,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        prometheus_textfile=args.prometheus_textfile,
+        profile_path=args.profile,
+        profile_rows=args.profile_rows,
+        rejects_path=args.rejects_file,
+        id_strategy=args.id_strategy,
+        index_window=args.index_window,
+        read_buffer=args.read_buffer,
+        maintain_aggregates=args.aggregates
+    )
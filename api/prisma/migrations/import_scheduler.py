@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Multi-Tenant Import Scheduler
+Runs property CSV imports for many tenants concurrently
+
+Jobs come from a JSON manifest (file paths are relative to the manifest; .gz, .bz2
+and .xz exports are decompressed as they are read):
+    
+    {"jobs": [
+        {"tenant": "agency-1", "user": "agency-1-admin", "files": ["agency-1/export.csv"]},
+        {"tenant": "agency-2", "user": "agency-2-admin", "files": ["a.csv", "b.csv"]}
+    ]}
+
+Work is handed out in fair batches of --fair-batch rows, round-robin over
+the tenants, to at most --workers threads. A tenant never has more than
+one batch in flight, so a huge export only ever occupies one worker while
+smaller tenants keep getting their turns; it also means a tenant's dedupe
+index, lookup resolvers, date parsers and rejects file are only touched by one
+thread at a time. Lookup mappings are loaded once per tenant, however many jobs
+the tenant has. Each batch is written and committed by PropertyBatchWriter,
+so bad rows are bisected out into the tenant's rejects file, and with
+--aggregates the tenant's property_aggregates counts are updated with
+each commit.
+
+Usage: python3 import_scheduler.py MANIFEST [--workers 4] [--fair-batch 2000] [--summary FILE]
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+
+import import_properties as importer
+from csv_sources import CsvSource
+from db_pool import MAX_POOL_SIZE, get_connection
+from dedupe_index import DEFAULT_INDEX_DIR, PropertyNumberIndex
+from import_metrics import ImportMetrics
+from property_aggregates import AggregateDeltas, prepare_tenant as prepare_aggregates
+from property_ids import DEFAULT_ID_STRATEGY, ID_STRATEGIES, id_generator
+
+DEFAULT_WORKERS = 4
+MAX_WORKERS = MAX_POOL_SIZE - 1  # One pooled connection per worker plus the scheduler's own
+DEFAULT_FAIR_BATCH = 2000  # Rows a tenant gets per turn
+DEFAULT_REJECTS_DIR = 'import_rejects'
+
+def load_manifest(path):
+    """List of {'tenant', 'user', 'files'} jobs with absolute file paths"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    jobs = []
+    for i, job in enumerate(manifest.get('jobs', [])):
+        missing = [key for key in ('tenant', 'user', 'files') if not job.get(key)]
+        if missing:
+            raise ValueError(f"Manifest job {i} is missing {', '.join(missing)}")
+        jobs.append({
+            'tenant': job['tenant'],
+            'user': job['user'],
+            'files': [str((path.parent / name).resolve()) for name in job['files']]
+        })
+    if not jobs:
+        raise ValueError(f"Manifest {path} has no jobs")
+    return jobs
+
+class MappingsCache:
+    """load_lookup_mappings() once per tenant"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.mappings = {}
+        self.loads = 0
+    
+    def get(self, conn, tenant_id):
+        with self.lock:
+            if tenant_id not in self.mappings:
+                self.mappings[tenant_id] = importer.load_lookup_mappings(conn, tenant_id)
+                self.loads += 1
+            return self.mappings[tenant_id]
+
+class TenantState:
+    """Everything shared by one tenant's jobs"""
+    
+    def __init__(self, tenant_id, mappings, dedupe_index, rejects_path, id_strategy, maintain_aggregates=False):
+        self.tenant_id = tenant_id
+        self.lookups = importer.PropertyLookups(mappings)
+        self.dedupe_index = dedupe_index
+        self.existing = len(dedupe_index)
+        self.rejects = importer.RejectsWriter(rejects_path)
+        self.aggregates = AggregateDeltas(tenant_id, importer.INSERT_COLUMNS) if maintain_aggregates else None
+        self.new_id = id_generator(id_strategy)
+        self.busy = False
+        self.stats = {'processed': 0, 'skipped': 0}
+        self.imported = 0
+        self.failed = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.started = None
+        self.finished = None
+        self.errors = []
+
+class ImportJob:
+    """One manifest entry: a user's files for a tenant, read in fair batches"""
+    
+    def __init__(self, spec, tenant):
+        self.user_id = spec['user']
+        self.files = spec['files']
+        self.tenant = tenant
+        self.rows = self._iter_rows()
+    
+    def _iter_rows(self):
+        for filepath in self.files:
+            if not Path(filepath).exists():
+                print(f"⚠️  [{self.tenant.tenant_id}] File not found: {filepath}")
+                continue
+            with CsvSource(filepath) as source:
+                yield from importer.iter_new_properties(
+                    importer.iter_csv_rows(source.stream), Path(filepath).name, self.tenant.dedupe_index,
+                    self.tenant.stats
+                )
+    
+    def run_batch(self, fair_batch, batch_size, max_batch_bytes, metrics):
+        """Read, transform and write the next fair batch; returns False once the job is exhausted"""
+        tenant = self.tenant
+        started = time.perf_counter()
+        if tenant.started is None:
+            tenant.started = started
+        
+        chunk = list(islice(self.rows, fair_batch))
+        if chunk:
+            conn = get_connection()
+            try:
+                writer = importer.PropertyBatchWriter(conn, batch_size, max_batch_bytes, metrics=metrics,
+                                                      rejects=tenant.rejects, new_id=tenant.new_id,
+                                                      aggregates=tenant.aggregates)
+                added = 0
+                try:
+                    for row, prop_number, _ in chunk:
+                        writer.add(importer.build_property_data(
+                            row, prop_number, tenant.lookups, tenant_id=tenant.tenant_id, user_id=self.user_id
+                        ))
+                        added += 1
+                    writer.close()
+                except BaseException:
+                    # Earlier flushes of this chunk are committed; forget only the rows that never made it
+                    tenant.dedupe_index.discard(writer.pending_numbers)
+                    tenant.dedupe_index.discard(prop_number for _, prop_number, _ in chunk[added:])
+                    writer.abort()
+                    raise
+                finally:
+                    tenant.imported += writer.imported
+                    tenant.failed += writer.failed
+                    tenant.dedupe_index.discard(writer.failed_numbers)
+            finally:
+                conn.close()
+            tenant.batches += 1
+        
+        tenant.finished = time.perf_counter()
+        tenant.busy_seconds += tenant.finished - started
+        return len(chunk) == fair_batch
+
+class ImportScheduler:
+    """Round-robin fair batches over tenants on a bounded thread pool"""
+    
+    def __init__(self, jobs, workers=DEFAULT_WORKERS, fair_batch=DEFAULT_FAIR_BATCH,
+                 batch_size=importer.DEFAULT_BATCH_SIZE, max_batch_bytes=importer.DEFAULT_MAX_BATCH_BYTES,
+                 index_dir=None, rejects_dir=None, id_strategy=DEFAULT_ID_STRATEGY, maintain_aggregates=False):
+        self.specs = jobs
+        self.workers = workers
+        self.fair_batch = fair_batch
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        migrations_dir = Path(__file__).parent
+        self.index_dir = index_dir or migrations_dir / DEFAULT_INDEX_DIR
+        self.rejects_dir = Path(rejects_dir or migrations_dir / DEFAULT_REJECTS_DIR)
+        self.id_strategy = id_strategy
+        self.maintain_aggregates = maintain_aggregates
+        self.metrics = ImportMetrics()
+        self.mappings_cache = MappingsCache()
+        self.tenants = {}
+        self.jobs = []
+    
+    def prepare(self):
+        """Load mappings and dedupe indexes for every tenant in the manifest"""
+        # The first request sizes the pool: one connection per worker plus this one
+        conn = get_connection(pool_size=self.workers + 1)
+        self.rejects_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            for spec in self.specs:
+                tenant_id = spec['tenant']
+                if tenant_id not in self.tenants:
+                    mappings = self.mappings_cache.get(conn, tenant_id)
+                    dedupe_index = PropertyNumberIndex.preload(conn, tenant_id, self.index_dir)
+                    if self.maintain_aggregates:
+                        prepare_aggregates(conn, tenant_id, len(dedupe_index))
+                    self.tenants[tenant_id] = TenantState(
+                        tenant_id, mappings, dedupe_index, self.rejects_dir / f"{tenant_id}.csv", self.id_strategy,
+                        self.maintain_aggregates
+                    )
+                    print(f"  {tenant_id}: {len(dedupe_index)} existing properties")
+                self.jobs.append(ImportJob(spec, self.tenants[tenant_id]))
+        finally:
+            conn.close()
+    
+    def run(self):
+        started = time.perf_counter()
+        ready = deque(self.jobs)
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tenant-import') as pool:
+            while ready or in_flight:
+                # Hand out turns in queue order, skipping jobs whose tenant already has a batch running
+                for _ in range(len(ready)):
+                    if len(in_flight) >= self.workers:
+                        break
+                    job = ready.popleft()
+                    if job.tenant.busy:
+                        ready.append(job)
+                        continue
+                    job.tenant.busy = True
+                    future = pool.submit(job.run_batch, self.fair_batch, self.batch_size, self.max_batch_bytes,
+                                         self.metrics)
+                    in_flight[future] = job
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    job.tenant.busy = False
+                    try:
+                        more = future.result()
+                    except Exception as e:
+                        # A failing tenant is dropped; the others carry on
+                        print(f"  ❌ [{job.tenant.tenant_id}] Import failed: {e}")
+                        job.tenant.errors.append(str(e))
+                        continue
+                    if more:
+                        ready.append(job)  # Back of the queue: everyone else goes first
+                    else:
+                        print(f"✅ [{job.tenant.tenant_id}] Finished {len(job.files)} file(s) for {job.user_id}")
+        
+        for tenant in self.tenants.values():
+            tenant.dedupe_index.save()
+            tenant.dedupe_index.close()
+            tenant.rejects.close()
+        return time.perf_counter() - started
+    
+    def summary(self, elapsed):
+        """Per-tenant results plus totals"""
+        tenants = {}
+        for tenant_id, tenant in self.tenants.items():
+            wall = (tenant.finished - tenant.started) if tenant.started is not None else 0.0
+            tenants[tenant_id] = {
+                'jobs': sum(1 for job in self.jobs if job.tenant is tenant),
+                'processed': tenant.stats['processed'],
+                'imported': tenant.imported,
+                'skipped': tenant.stats['skipped'],
+                'rejected': tenant.failed,
+                'existing': tenant.existing,
+                'batches': tenant.batches,
+                'unmapped': {resolver.name: sum(resolver.unmapped.values())
+                             for resolver in tenant.lookups.resolvers.values()},
+                'busy_seconds': round(tenant.busy_seconds, 3),
+                'wall_seconds': round(wall, 3),
+                'rows_per_sec': round(tenant.imported / tenant.busy_seconds) if tenant.busy_seconds else None,
+                'errors': tenant.errors
+            }
+        imported = sum(t['imported'] for t in tenants.values())
+        return {
+            'workers': self.workers,
+            'fair_batch': self.fair_batch,
+            'elapsed_seconds': round(elapsed, 3),
+            'imported': imported,
+            'rows_per_sec': round(imported / elapsed) if elapsed else None,
+            'mapping_loads': self.mappings_cache.loads,
+            'tenants': tenants
+        }
+
+def print_summary(summary):
+    print(f"\n{'='*78}")
+    print("📊 MULTI-TENANT IMPORT SUMMARY")
+    print(f"{'='*78}")
+    print(f"{'Tenant':24s} {'Processed':>10s} {'Imported':>10s} {'Skipped':>8s} {'Rejected':>8s} "
+          f"{'Busy s':>8s} {'Rows/s':>8s}")
+    for tenant_id, t in summary['tenants'].items():
+        status = ' ❌' if t['errors'] else ''
+        print(f"{tenant_id:24s} {t['processed']:>10} {t['imported']:>10} {t['skipped']:>8} {t['rejected']:>8} "
+              f"{t['busy_seconds']:>8.2f} {t['rows_per_sec'] or 0:>8}{status}")
+    print(f"{'-'*78}")
+    print(f"Tenants: {len(summary['tenants'])}, workers: {summary['workers']}, "
+          f"lookup mapping loads: {summary['mapping_loads']}")
+    print(f"✅ Imported {summary['imported']} properties in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['rows_per_sec'] or 0} rows/sec overall)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import property CSVs for many tenants concurrently')
+    parser.add_argument('manifest', help='JSON manifest of {tenant, user, files} jobs')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'concurrent import threads (one database connection each, at most {MAX_WORKERS})')
+    parser.add_argument('--fair-batch', type=int, default=DEFAULT_FAIR_BATCH,
+                        help='rows a tenant imports per turn before the next tenant gets one')
+    parser.add_argument('--batch-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+                        help='rows per multi-row INSERT')
+    parser.add_argument('--max-batch-bytes', type=int, default=importer.DEFAULT_MAX_BATCH_BYTES,
+                        help='approximate statement size ceiling per INSERT')
+    parser.add_argument('--dedupe-index', default=None,
+                        help=f'directory for per-tenant property number indexes (default: {DEFAULT_INDEX_DIR})')
+    parser.add_argument('--rejects-dir', default=None,
+                        help=f'directory for per-tenant rejects CSVs (default: {DEFAULT_REJECTS_DIR})')
+    parser.add_argument('--id-strategy', choices=ID_STRATEGIES, default=DEFAULT_ID_STRATEGY)
+    parser.add_argument('--aggregates', action='store_true',
+                        help='keep property_aggregates current as batches commit (see property_aggregates.py)')
+    parser.add_argument('--summary', default=None, help='also write the summary as JSON to this file')
+    args = parser.parse_args()
+    if not 1 <= args.workers <= MAX_WORKERS:
+        parser.error(f'--workers must be between 1 and {MAX_WORKERS} (mysql.connector pools hold at most '
+                     f'{MAX_POOL_SIZE} connections)')
+    
+    jobs = load_manifest(args.manifest)
+    scheduler = ImportScheduler(
+        jobs,
+        workers=args.workers,
+        fair_batch=args.fair_batch,
+        batch_size=args.batch_size,
+        max_batch_bytes=args.max_batch_bytes,
+        index_dir=args.dedupe_index,
+        rejects_dir=args.rejects_dir,
+        id_strategy=args.id_strategy,
+        maintain_aggregates=args.aggregates
+    )
+    
+    print("="*60)
+    print("🚀 MULTI-TENANT PROPERTY IMPORTER")
+    print("="*60)
+    print(f"Jobs: {len(jobs)}, tenants: {len({job['tenant'] for job in jobs})}, workers: {args.workers}")
+    scheduler.prepare()
+    elapsed = scheduler.run()
+    summary = scheduler.summary(elapsed)
+    print_summary(summary)
+    scheduler.metrics.print_report()
+    
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n💾 Summary saved to: {args.summary}")
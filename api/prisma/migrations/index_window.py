@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Index Window
+Defers secondary index and foreign key maintenance during a bulk load
+
+Every row written to properties updates ~30 secondary indexes and checks
+~24 foreign keys. For a large initial load it is cheaper to drop them,
+load, and rebuild: all indexes are added back in one ALTER TABLE (one
+sorted build per index), and the foreign keys are re-added with
+foreign_key_checks=0, which is a metadata-only change. Because re-adding
+them that way does not validate existing rows, referential integrity is
+then checked with one anti-join per foreign key.
+
+The dropped definitions are taken verbatim from SHOW CREATE TABLE and
+saved to a state file before anything is altered, so an interrupted load
+is repaired by IndexWindow.recover() on the next run. MySQL refuses to
+drop an index a foreign key depends on, even with foreign_key_checks=0,
+which is why the constraints are dropped too. PRIMARY and UNIQUE keys stay
+in place (the importer relies on property_number being unique).
+
+Only use this while nothing else writes to the table.
+"""
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+DEFAULT_WINDOW_STATE_FILE = '.index_window.json'
+WINDOW_LOCK_WAIT_TIMEOUT = 600  # Seconds an ALTER may wait for metadata locks
+ORPHAN_SAMPLE_SIZE = 5
+
+KEY_LINE = re.compile(r"^\s*((?:FULLTEXT |SPATIAL )?KEY `([^`]+)` .+?),?$")
+FOREIGN_KEY_LINE = re.compile(
+    r"^\s*(CONSTRAINT `([^`]+)` FOREIGN KEY \(([^)]+)\) REFERENCES `([^`]+)` \(([^)]+)\).*?),?$"
+)
+
+def split_columns(column_list):
+    """'`a`, `b`' -> ['a', 'b']"""
+    return [col.strip().strip('`') for col in column_list.split(',')]
+
+def table_definition(conn, table):
+    """Secondary (non-unique) index and foreign key clauses from SHOW CREATE TABLE"""
+    cursor = conn.cursor()
+    cursor.execute(f"SHOW CREATE TABLE `{table}`")
+    ddl = cursor.fetchone()[1]
+    cursor.close()
+    
+    indexes = {}
+    foreign_keys = {}
+    for line in ddl.splitlines():
+        match = FOREIGN_KEY_LINE.match(line)
+        if match:
+            clause, name, columns, ref_table, ref_columns = match.groups()
+            foreign_keys[name] = {
+                'clause': clause,
+                'columns': split_columns(columns),
+                'ref_table': ref_table,
+                'ref_columns': split_columns(ref_columns)
+            }
+            continue
+        match = KEY_LINE.match(line)
+        if match:
+            clause, name = match.groups()
+            indexes[name] = clause
+    return indexes, foreign_keys
+
+class IndexWindow:
+    """Drops a table's secondary indexes and foreign keys for a load, then restores them"""
+    
+    def __init__(self, conn, table='properties', state_path=None, metrics=None):
+        self.conn = conn
+        self.table = table
+        self.state_path = Path(state_path or Path(__file__).parent / DEFAULT_WINDOW_STATE_FILE)
+        self.metrics = metrics
+        self.indexes = {}
+        self.foreign_keys = {}
+        self.timings = {}
+        self.opened_at = None
+        self.violations = {}
+    
+    def _timed(self, phase, started):
+        self.timings[phase] = time.perf_counter() - started
+        if self.metrics:
+            self.metrics.observe(f"window_{phase}", self.timings[phase])
+    
+    def _alter(self, cursor, clauses):
+        if clauses:
+            cursor.execute(f"ALTER TABLE `{self.table}` " + ', '.join(clauses))
+    
+    def _save_state(self):
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'table': self.table, 'indexes': self.indexes, 'foreign_keys': self.foreign_keys}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+    
+    def open(self):
+        """Record the definitions, then drop foreign keys and secondary indexes"""
+        if self.state_path.exists():
+            raise RuntimeError(f"An index window is still open ({self.state_path}); run IndexWindow.recover() first")
+        
+        started = time.perf_counter()
+        self.indexes, self.foreign_keys = table_definition(self.conn, self.table)
+        self._save_state()
+        
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SET SESSION lock_wait_timeout = %s", (WINDOW_LOCK_WAIT_TIMEOUT,))
+            self._alter(cursor, [f"DROP FOREIGN KEY `{name}`" for name in self.foreign_keys])
+            self._alter(cursor, [f"DROP INDEX `{name}`" for name in self.indexes])
+        except Exception:
+            self.restore()
+            raise
+        finally:
+            cursor.close()
+        
+        self._timed('drop', started)
+        self.opened_at = time.perf_counter()
+        print(f"🪟 Index window open on {self.table}: dropped {len(self.indexes)} indexes "
+              f"and {len(self.foreign_keys)} foreign keys ({self.timings['drop']:.2f}s)")
+    
+    def restore(self):
+        """Add back whatever is missing: indexes in one pass, then foreign keys without validation"""
+        if self.opened_at is not None:
+            self._timed('load', self.opened_at)
+            self.opened_at = None
+        
+        current_indexes, current_foreign_keys = table_definition(self.conn, self.table)
+        cursor = self.conn.cursor()
+        cursor.execute("SET SESSION lock_wait_timeout = %s", (WINDOW_LOCK_WAIT_TIMEOUT,))
+        
+        started = time.perf_counter()
+        self._alter(cursor, [f"ADD {clause}" for name, clause in self.indexes.items() if name not in current_indexes])
+        self._timed('rebuild_indexes', started)
+        
+        # With checks off, ADD FOREIGN KEY is in-place and skips the per-row scan; verify() does that instead
+        started = time.perf_counter()
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        try:
+            self._alter(cursor, [
+                f"ADD {fk['clause']}" for name, fk in self.foreign_keys.items() if name not in current_foreign_keys
+            ])
+        finally:
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.close()
+        self._timed('restore_foreign_keys', started)
+        
+        self.state_path.unlink(missing_ok=True)
+        print(f"🪟 Index window closed: indexes rebuilt in {self.timings['rebuild_indexes']:.2f}s, "
+              f"foreign keys restored in {self.timings['restore_foreign_keys']:.2f}s")
+    
+    def verify(self):
+        """Count rows whose foreign key values have no parent row; returns {constraint: count}"""
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        self.violations = {}
+        for name, fk in self.foreign_keys.items():
+            join = ' AND '.join(f"p.`{ref}` = c.`{col}`" for col, ref in zip(fk['columns'], fk['ref_columns']))
+            orphaned = (
+                f"FROM `{self.table}` c LEFT JOIN `{fk['ref_table']}` p ON {join} "
+                f"WHERE {' AND '.join(f'c.`{col}` IS NOT NULL' for col in fk['columns'])} "
+                f"AND p.`{fk['ref_columns'][0]}` IS NULL"
+            )
+            cursor.execute(f"SELECT COUNT(*) {orphaned}")
+            count = cursor.fetchone()[0]
+            if not count:
+                continue
+            
+            self.violations[name] = count
+            columns = ', '.join(f"c.`{col}`" for col in fk['columns'])
+            cursor.execute(f"SELECT DISTINCT {columns} {orphaned} LIMIT {ORPHAN_SAMPLE_SIZE}")
+            samples = [row[0] if len(row) == 1 else row for row in cursor.fetchall()]
+            print(f"  ❌ {name}: {count} rows reference missing {fk['ref_table']} rows (e.g. {samples})")
+        cursor.close()
+        self._timed('verify', started)
+        
+        if self.violations:
+            print(f"❌ Referential integrity check failed for {len(self.violations)} foreign keys")
+        else:
+            print(f"✅ Referential integrity verified for {len(self.foreign_keys)} foreign keys "
+                  f"({self.timings['verify']:.2f}s)")
+        return self.violations
+    
+    def print_report(self):
+        print("\n⏱️  Index window phases:")
+        for phase, seconds in self.timings.items():
+            print(f"  {phase}: {seconds:.2f}s")
+    
+    @classmethod
+    def recover(cls, conn, state_path=None):
+        """Restore definitions left dropped by an interrupted run; returns True if anything was pending"""
+        window = cls(conn, state_path=state_path)
+        if not window.state_path.exists():
+            return False
+        
+        with open(window.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        window.table = state['table']
+        window.indexes = state['indexes']
+        window.foreign_keys = state['foreign_keys']
+        print(f"⚠️  Restoring indexes and foreign keys left dropped by an interrupted load ({window.state_path})")
+        window.restore()
+        window.verify()
+        return True
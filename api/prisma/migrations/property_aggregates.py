@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Property Aggregates
+Per-tenant property counts by type, status, region and month
+
+The import summary and the dashboard report properties by type, status,
+region and date range with GROUP BY scans over properties. The
+property_aggregates table holds the same counts, one row per tenant x
+type x status x region x month of created_at, so those reports read a few
+hundred rows instead. The table is model property_aggregates in
+schema.prisma and is created with the rest of the schema
+(npm run prisma:push); nothing here issues DDL.
+
+With --aggregates the importers keep it current: each batch's count
+changes are collected as rows go in and upserted just before the batch
+commits, in the same transaction, so the table never disagrees with
+committed properties. An upsert that changes an existing row's type,
+status or region moves its count from the old group to the new one. A
+missing lookup is stored as '' because NULL would defeat the primary key.
+
+Imports without --aggregates and rows written outside the importer are
+not counted; the next --aggregates import finds that the tenant's total
+no longer matches and rebuilds its counts. --verify recomputes the counts
+from properties and diffs them against the table, --rebuild replaces them.
+
+Usage: python3 property_aggregates.py [--tenant ID] [--verify | --rebuild]
+"""
+import argparse
+from collections import Counter
+from datetime import datetime
+from db_pool import get_connection
+
+AGGREGATES_TABLE = 'property_aggregates'
+GROUP_COLUMNS = ('company_id', 'type_id', 'status_id', 'region_id', 'month')
+MISMATCH_SAMPLE_SIZE = 20
+MONTH_FORMAT = '%Y-%m'  # Same directives in MySQL DATE_FORMAT() and Python strftime()
+
+ER_NO_SUCH_TABLE = 1146
+
+# The same grouping, as SQL over a table shaped like properties
+GROUP_EXPRESSIONS = (
+    "company_id, COALESCE(type_id, ''), COALESCE(status_id, ''), COALESCE(region_id, ''), "
+    f"COALESCE(DATE_FORMAT(created_at, '{MONTH_FORMAT}'), '')"
+)
+
+UPSERT_SUFFIX = " ON DUPLICATE KEY UPDATE property_count = property_count + VALUES(property_count)"
+
+def month_of(created_at):
+    """Month group of a datetime or an ISO date string, as GROUP_EXPRESSIONS computes it"""
+    if created_at is None:
+        return ''
+    if not hasattr(created_at, 'strftime'):
+        created_at = datetime.fromisoformat(str(created_at))
+    return created_at.strftime(MONTH_FORMAT)
+
+def insert_grouped_sql(source_table, where=''):
+    """INSERT ... SELECT that adds source_table's rows to their groups"""
+    return (
+        f"INSERT INTO {AGGREGATES_TABLE} ({', '.join(GROUP_COLUMNS)}, property_count) "
+        f"SELECT {GROUP_EXPRESSIONS}, COUNT(*) FROM {source_table} {where} "
+        f"GROUP BY 1, 2, 3, 4, 5" + UPSERT_SUFFIX
+    )
+
+class AggregateDeltas:
+    """One tenant's count changes since the last commit
+    
+    columns is the order of the insert parameters (INSERT_COLUMNS); the
+    writer records every row it inserted and calls flush() right before
+    committing, or discard() when it rolls back.
+    """
+    
+    def __init__(self, tenant_id, columns):
+        self.tenant_id = tenant_id
+        self.number_index = columns.index('property_number')
+        self.key_indices = [columns.index(col) for col in ('type_id', 'status_id', 'region_id', 'created_at')]
+        self.deltas = Counter()
+        self.groups_written = 0
+    
+    def _key(self, type_id, status_id, region_id, created_at):
+        return (self.tenant_id, type_id or '', status_id or '', region_id or '', month_of(created_at))
+    
+    def previous_groups(self, cursor, rows):
+        """Current (type, status, region, created_at) of this tenant's rows an upsert is about to touch"""
+        numbers = [params[self.number_index] for params in rows]
+        cursor.execute(
+            "SELECT property_number, type_id, status_id, region_id, created_at FROM properties "
+            f"WHERE company_id = %s AND property_number IN ({', '.join(['%s'] * len(numbers))})",
+            [self.tenant_id] + numbers
+        )
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    def add(self, rows, previous=None):
+        """Count inserted rows; with previous (an upsert), move updated rows between groups"""
+        for params in rows:
+            type_id, status_id, region_id, created_at = (params[i] for i in self.key_indices)
+            old = previous.get(params[self.number_index]) if previous else None
+            if old is None:
+                self.deltas[self._key(type_id, status_id, region_id, created_at)] += 1
+                continue
+            
+            old_type, old_status, old_region, old_created_at = old
+            # created_at is kept on update, so the row stays in its month
+            self.deltas[self._key(old_type, old_status, old_region, old_created_at)] -= 1
+            self.deltas[self._key(type_id, status_id, region_id, old_created_at)] += 1
+    
+    def flush(self, cursor):
+        """Upsert the pending changes into the summary table (inside the caller's transaction)"""
+        changes = [(key, delta) for key, delta in self.deltas.items() if delta]
+        self.deltas.clear()
+        if not changes:
+            return
+        
+        cursor.execute(
+            f"INSERT INTO {AGGREGATES_TABLE} ({', '.join(GROUP_COLUMNS)}, property_count) VALUES "
+            + ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(changes)) + UPSERT_SUFFIX,
+            [v for key, delta in changes for v in key + (delta,)]
+        )
+        if any(delta < 0 for _, delta in changes):
+            cursor.execute(f"DELETE FROM {AGGREGATES_TABLE} WHERE company_id = %s AND property_count <= 0",
+                           (self.tenant_id,))
+        self.groups_written += len(changes)
+    
+    def flush_table(self, cursor, table):
+        """Add every row of a staging table shaped like properties (the bulk load path)"""
+        cursor.execute(insert_grouped_sql(table))
+    
+    def discard(self):
+        self.deltas.clear()
+
+def prepare_tenant(conn, tenant_id, property_count):
+    """Rebuild the tenant's counts only if they do not add up to property_count"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COALESCE(SUM(property_count), 0) FROM {AGGREGATES_TABLE} WHERE company_id = %s",
+                       (tenant_id,))
+    except Exception as e:
+        if getattr(e, 'errno', None) == ER_NO_SUCH_TABLE:
+            raise RuntimeError(f"{AGGREGATES_TABLE} does not exist; create it from schema.prisma "
+                               f"(npm run prisma:push in api/)") from e
+        raise
+    counted = int(cursor.fetchone()[0])
+    cursor.close()
+    if counted != property_count:
+        print(f"⚠️  {AGGREGATES_TABLE} counts {counted} properties for {tenant_id}, not {property_count}; rebuilding")
+        rebuild(conn, tenant_id)
+
+def rebuild(conn, tenant_id=None):
+    """Replace the counts (of one tenant, or all) with a fresh GROUP BY over properties"""
+    cursor = conn.cursor()
+    if tenant_id:
+        cursor.execute(f"DELETE FROM {AGGREGATES_TABLE} WHERE company_id = %s", (tenant_id,))
+        cursor.execute(insert_grouped_sql('properties', 'WHERE company_id = %s'), (tenant_id,))
+    else:
+        cursor.execute(f"DELETE FROM {AGGREGATES_TABLE}")
+        cursor.execute(insert_grouped_sql('properties'))
+    conn.commit()
+    cursor.close()
+
+def verify(conn, tenant_id=None):
+    """Recompute the counts from properties and diff them against the table; returns the mismatches"""
+    where = 'WHERE company_id = %s' if tenant_id else ''
+    params = (tenant_id,) if tenant_id else ()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {GROUP_EXPRESSIONS}, COUNT(*) FROM properties {where} GROUP BY 1, 2, 3, 4, 5", params)
+    expected = {tuple(row[:5]): int(row[5]) for row in cursor.fetchall()}
+    cursor.execute(
+        f"SELECT {', '.join(GROUP_COLUMNS)}, property_count FROM {AGGREGATES_TABLE} {where}", params
+    )
+    stored = {tuple(row[:5]): int(row[5]) for row in cursor.fetchall() if row[5]}
+    cursor.close()
+    
+    mismatches = [
+        (key, expected.get(key, 0), stored.get(key, 0))
+        for key in sorted(expected.keys() | stored.keys())
+        if expected.get(key, 0) != stored.get(key, 0)
+    ]
+    for key, actual, recorded in mismatches[:MISMATCH_SAMPLE_SIZE]:
+        print(f"  ❌ {dict(zip(GROUP_COLUMNS, key))}: properties has {actual}, {AGGREGATES_TABLE} has {recorded}")
+    if len(mismatches) > MISMATCH_SAMPLE_SIZE:
+        print(f"  ... and {len(mismatches) - MISMATCH_SAMPLE_SIZE} more")
+    
+    if mismatches:
+        print(f"❌ {len(mismatches)} of {len(expected)} groups differ from properties")
+    else:
+        print(f"✅ {AGGREGATES_TABLE} matches properties ({len(expected)} groups, {sum(expected.values())} properties)")
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=f'Check or rebuild the {AGGREGATES_TABLE} summary table')
+    parser.add_argument('--tenant', default=None, help='only this company_id (default: all tenants)')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--verify', action='store_true',
+                        help='recompute the counts from properties and report differences (the default)')
+    action.add_argument('--rebuild', action='store_true', help='replace the stored counts with recomputed ones')
+    args = parser.parse_args()
+    
+    conn = get_connection()
+    if args.rebuild:
+        rebuild(conn, args.tenant)
+        print(f"✅ Rebuilt {AGGREGATES_TABLE}")
+        conn.close()
+        raise SystemExit(0)
+    
+    mismatches = verify(conn, args.tenant)
+    conn.close()
+    raise SystemExit(1 if mismatches else 0)
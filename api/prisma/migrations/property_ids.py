@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Property IDs
+Client-side, time-ordered primary keys for properties inserts
+
+MariaDB's UUID() is a version 1 UUID whose text form starts with the low
+bits of the timestamp, so consecutive inserts land all over the InnoDB
+clustered index. UUIDv7 (RFC 9562) puts the Unix time in milliseconds
+first: the text form sorts by creation time, new rows append to the right
+edge of the primary key, and the importer knows each ID without reading
+it back.
+"""
+import os
+import time
+
+ID_STRATEGIES = ('uuid', 'uuid7')  # 'uuid' = the database's UUID()
+DEFAULT_ID_STRATEGY = 'uuid'
+
+COUNTER_BITS = 12  # rand_a holds a per-millisecond counter (RFC 9562 method 1)
+COUNTER_MAX = (1 << COUNTER_BITS) - 1
+RAND_B_MASK = (1 << 62) - 1
+
+class UUID7Generator:
+    """Monotonic UUIDv7 strings: later calls always sort after earlier ones
+    
+    Within one millisecond the 12-bit counter is incremented (seeded at a
+    random value below 2048 so there is room to count up); if it overflows,
+    or the clock goes backwards, the timestamp is carried forward instead.
+    """
+    
+    def __init__(self):
+        self.last_ms = 0
+        self.counter = 0
+    
+    def __call__(self):
+        now_ms = time.time_ns() // 1000000
+        if now_ms > self.last_ms:
+            self.last_ms = now_ms
+            self.counter = int.from_bytes(os.urandom(2), 'big') >> 5
+        else:
+            self.counter += 1
+            if self.counter > COUNTER_MAX:
+                self.last_ms += 1
+                self.counter = 0
+        
+        rand_b = int.from_bytes(os.urandom(8), 'big') & RAND_B_MASK
+        value = (self.last_ms << 80) | (0x7 << 76) | (self.counter << 64) | (0b10 << 62) | rand_b
+        text = f"{value:032x}"
+        return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+def id_generator(strategy=DEFAULT_ID_STRATEGY):
+    """Callable producing client-side IDs, or None to let the database call UUID()"""
+    if strategy == 'uuid':
+        return None
+    if strategy == 'uuid7':
+        return UUID7Generator()
+    raise ValueError(f"Unknown ID strategy: {strategy}")
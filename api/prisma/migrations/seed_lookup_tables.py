@@ -1,216 +1,291 @@
 #!/usr/bin/env python3
 """
 Seed lookup tables for property import
+
+Seeds any number of tenants at once: for each lookup table the rows that
+already exist for the tenant set are read in one query, and only the
+missing (tenant, value) pairs are inserted with multi-row statements,
+one transaction per table.
+
+Usage: python3 seed_lookup_tables.py [--tenant TENANT_ID[:USER_ID] ...] [--tenants-file FILE]
 """
-import mysql.connector
-import uuid
-
-# Database connection
-db_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'zerocall',
-    'database': 'contaboo',
-    'charset': 'utf8mb4'
-}
-
-# Tenant and User IDs
+import argparse
+import time
+from db_pool import get_connection
+
+# Tenant and User IDs (used when no tenants are given on the command line)
 TENANT_ID = 'demo-tenant-1'
 USER_ID = '2d0e59cf-3c22-4280-8bae-34b0072c6d2d'
 
-def get_db_connection():
-    """Create database connection"""
-    return mysql.connector.connect(**db_config)
-
-def seed_property_categories(cursor):
-    """Seed property categories"""
-    print("📁 Seeding property categories...")
-    categories = [
-        ('RESIDENTIAL', 'Residential', 'Residential properties'),
-        ('ADMIN', 'Administrative', 'Administrative properties'),
-        ('COMMERCIAL', 'Commercial', 'Commercial properties'),
-        ('CLINICS', 'Clinics', 'Medical clinics'),
-        ('RESIDENTIAL_OFFICE', 'Residential + Office', 'Mixed residential and office'),
-        ('MIXED_USE', 'Mixed Use', 'Mixed use properties')
-    ]
-    
-    for code, name, desc in categories:
-        cursor.execute("""
-            INSERT INTO property_categories (id, company_id, name, description, is_active, sort_order, updated_at)
-            VALUES (UUID(), %s, %s, %s, TRUE, 1, NOW())
-            ON DUPLICATE KEY UPDATE name=name
-        """, (TENANT_ID, name, desc))
-    
-    print(f"  ✅ Seeded {len(categories)} categories")
-
-def seed_property_types(cursor):
-    """Seed property types"""
-    print("🏠 Seeding property types...")
-    types = [
-        'APARTMENT_COMPOUND', 'APARTMENT_OUT', 'STANDALONE_COMPOUND', 'VILLA_OUT',
-        'TOWNHOUSE', 'TOWNHOUSE_CORNER', 'TWIN_HOUSE', 'DUPLEX_GB', 'DUPLEX_GF',
-        'DUPLEX_ROOF', 'ROOF', 'STUDIO', 'OFFICE_SPACE', 'CLINIC', 'ADMIN_BUILDING',
-        'ADMIN_RETAIL_BUILDING', 'RETAIL', 'RETAIL_BUILDING', 'BASEMENT', 'FACTORY',
-        'PHARMACY', 'CHALET', 'I_VILLA_G', 'I_VILLA_R', 'LAND', 'GAS_STATION',
-        'BUILDING', 'HOSPITAL'
-    ]
-    
-    for type_code in types:
-        name = type_code.replace('_', ' ').title()
-        cursor.execute("""
-            INSERT INTO PropertyType (id, company_id, name, is_active, sort_order, updated_at)
-            VALUES (UUID(), %s, %s, TRUE, 1, NOW())
-            ON DUPLICATE KEY UPDATE name=name
-        """, (TENANT_ID, name))
-    
-    print(f"  ✅ Seeded {len(types)} property types")
-
-def seed_property_statuses(cursor):
-    """Seed property statuses"""
-    print("📋 Seeding property statuses...")
-    statuses = [
-        ('FOR_SALE', 'For Sale', '#3b82f6'),
-        ('FOR_RENT', 'For Rent', '#10b981'),
-        ('SOLD_OUT', 'Sold Out', '#ef4444'),
-        ('NOW_RENTED', 'Now Rented', '#8b5cf6'),
-        ('HOLD', 'Hold', '#f59e0b'),
-        ('RECYCLE', 'Recycle', '#6b7280'),
-        ('UNKNOWN', 'Unknown', '#9ca3af')
-    ]
-    
-    for code, name, color in statuses:
-        cursor.execute("""
-            INSERT INTO property_statuses (id, company_id, created_by_id, name, color, display_order, is_active)
-            VALUES (UUID(), %s, %s, %s, %s, 1, TRUE)
-            ON DUPLICATE KEY UPDATE name=name
-        """, (TENANT_ID, USER_ID, name, color))
-    
-    print(f"  ✅ Seeded {len(statuses)} property statuses")
-
-def seed_finishing_statuses(cursor):
-    """Seed finishing statuses"""
-    print("🎨 Seeding finishing statuses...")
-    finishing = [
-        ('FULLY_FINISHED', 'Fully Finished'),
-        ('SEMI_FINISHED', 'Semi Finished'),
-        ('FULLY_FURNISHED', 'Fully Furnished'),
-        ('SKELETON', 'Skeleton'),
-        ('SEMI_FURNITURE', 'Semi Furnished')
-    ]
-    
-    for code, name in finishing:
-        cursor.execute("""
-            INSERT INTO finishing_statuses (id, company_id, created_by_id, name, display_order, is_active)
-            VALUES (UUID(), %s, %s, %s, 1, TRUE)
-            ON DUPLICATE KEY UPDATE name=name
-        """, (TENANT_ID, USER_ID, name))
-    
-    print(f"  ✅ Seeded {len(finishing)} finishing statuses")
-
-def seed_currencies(cursor):
-    """Seed currencies"""
-    print("💰 Seeding currencies...")
-    currencies = [
-        ('EGP', 'Egyptian Pound', 'E£'),
-        ('USD', 'US Dollar', '$'),
-        ('EUR', 'Euro', '€')
-    ]
+# Tenants per existing-rows query and rows per INSERT statement
+TENANT_QUERY_CHUNK = 500
+INSERT_BATCH_ROWS = 1000
+
+PROPERTY_CATEGORIES = [
+    ('RESIDENTIAL', 'Residential', 'Residential properties'),
+    ('ADMIN', 'Administrative', 'Administrative properties'),
+    ('COMMERCIAL', 'Commercial', 'Commercial properties'),
+    ('CLINICS', 'Clinics', 'Medical clinics'),
+    ('RESIDENTIAL_OFFICE', 'Residential + Office', 'Mixed residential and office'),
+    ('MIXED_USE', 'Mixed Use', 'Mixed use properties')
+]
+
+PROPERTY_TYPES = [
+    'APARTMENT_COMPOUND', 'APARTMENT_OUT', 'STANDALONE_COMPOUND', 'VILLA_OUT',
+    'TOWNHOUSE', 'TOWNHOUSE_CORNER', 'TWIN_HOUSE', 'DUPLEX_GB', 'DUPLEX_GF',
+    'DUPLEX_ROOF', 'ROOF', 'STUDIO', 'OFFICE_SPACE', 'CLINIC', 'ADMIN_BUILDING',
+    'ADMIN_RETAIL_BUILDING', 'RETAIL', 'RETAIL_BUILDING', 'BASEMENT', 'FACTORY',
+    'PHARMACY', 'CHALET', 'I_VILLA_G', 'I_VILLA_R', 'LAND', 'GAS_STATION',
+    'BUILDING', 'HOSPITAL'
+]
+
+PROPERTY_STATUSES = [
+    ('FOR_SALE', 'For Sale', '#3b82f6'),
+    ('FOR_RENT', 'For Rent', '#10b981'),
+    ('SOLD_OUT', 'Sold Out', '#ef4444'),
+    ('NOW_RENTED', 'Now Rented', '#8b5cf6'),
+    ('HOLD', 'Hold', '#f59e0b'),
+    ('RECYCLE', 'Recycle', '#6b7280'),
+    ('UNKNOWN', 'Unknown', '#9ca3af')
+]
+
+FINISHING_STATUSES = [
+    ('FULLY_FINISHED', 'Fully Finished'),
+    ('SEMI_FINISHED', 'Semi Finished'),
+    ('FULLY_FURNISHED', 'Fully Furnished'),
+    ('SKELETON', 'Skeleton'),
+    ('SEMI_FURNITURE', 'Semi Furnished')
+]
+
+CURRENCIES = [
+    ('EGP', 'Egyptian Pound', 'E£'),
+    ('USD', 'US Dollar', '$'),
+    ('EUR', 'Euro', '€')
+]
+
+REGIONS = [
+    ('NEW_CAIRO', 'New Cairo'),
+    ('KATAMEYA', 'Katameya'),
+    ('FIFTH_SETTLEMENT', '5th Settlement'),
+    ('WEST_GOLF', 'West Golf'),
+    ('HYDE_PARK', 'Hyde Park'),
+    ('MIVIDA', 'Mivida'),
+    ('UPTOWN_CAIRO', 'Uptown Cairo'),
+    ('STELLA_HEIGHTS', 'Stella Heights'),
+    ('MARASSI', 'Marassi'),
+    ('NORTH_COAST', 'North Coast'),
+    ('AIN_SOKHNA', 'Ain Sokhna'),
+    ('OCTOBER', '6th of October'),
+    ('MAADI', 'Maadi'),
+    ('HELIOPOLIS', 'Heliopolis'),
+    ('ZAMALEK', 'Zamalek'),
+    ('NASR_CITY', 'Nasr City'),
+    ('REHAB_CITY', 'Rehab City'),
+    ('SHOROUK', 'Shorouk'),
+    ('HELWAN', 'Helwan'),
+    ('TAGAMOA', 'Tagamoa'),
+    ('MOUNTAIN_VIEW', 'Mountain View'),
+    ('PALM_HILLS', 'Palm Hills'),
+    ('SODIC', 'Sodic'),
+    ('EMAAR', 'Emaar'),
+    ('COMPOUND_90', 'Compound 90'),
+    ('EASTOWN', 'Eastown'),
+    ('CAIRO_FESTIVAL_CITY', 'Cairo Festival City'),
+    ('ALLEGRIA', 'Allegria'),
+    ('ZAYED', 'Sheikh Zayed'),
+    ('DOWNTOWN', 'Downtown'),
+    ('GARDEN_CITY', 'Garden City'),
+    ('MOHANDESSIN', 'Mohandessin'),
+    ('DOKKI', 'Dokki'),
+    ('AGOUZA', 'Agouza'),
+    ('GIZA', 'Giza'),
+    ('SMART_VILLAGE', 'Smart Village'),
+    ('NEW_ZAYED', 'New Zayed')
+]
+
+# Per-tenant lookup tables. 'columns' are filled from 'rows', 'defaults' are
+# SQL literals shared by every row, and 'name' is the per-tenant unique value.
+LOOKUP_TABLES = [
+    {
+        'table': 'property_categories',
+        'label': '📁 property categories',
+        'with_creator': False,
+        'columns': ('name', 'description'),
+        'defaults': (('is_active', 'TRUE'), ('sort_order', '1'), ('updated_at', 'NOW()')),
+        'rows': [(name, desc) for code, name, desc in PROPERTY_CATEGORIES]
+    },
+    {
+        'table': 'PropertyType',
+        'label': '🏠 property types',
+        'with_creator': False,
+        'columns': ('name',),
+        'defaults': (('is_active', 'TRUE'), ('sort_order', '1'), ('updated_at', 'NOW()')),
+        'rows': [(type_code.replace('_', ' ').title(),) for type_code in PROPERTY_TYPES]
+    },
+    {
+        'table': 'property_statuses',
+        'label': '📋 property statuses',
+        'with_creator': True,
+        'columns': ('name', 'color'),
+        'defaults': (('display_order', '1'), ('is_active', 'TRUE')),
+        'rows': [(name, color) for code, name, color in PROPERTY_STATUSES]
+    },
+    {
+        'table': 'finishing_statuses',
+        'label': '🎨 finishing statuses',
+        'with_creator': True,
+        'columns': ('name',),
+        'defaults': (('display_order', '1'), ('is_active', 'TRUE')),
+        'rows': [(name,) for code, name in FINISHING_STATUSES]
+    },
+    {
+        'table': 'regions',
+        'label': '🗺️  regions',
+        'with_creator': True,
+        'columns': ('name', 'display_name'),
+        'defaults': (('display_order', '1'), ('is_active', 'TRUE')),
+        'rows': [(name, name) for code, name in REGIONS]
+    }
+]
+
+def parse_tenant(spec):
+    """'tenant_id[:user_id]' -> (tenant_id, user_id)"""
+    tenant_id, _, user_id = spec.strip().partition(':')
+    return tenant_id, user_id or USER_ID
+
+def load_tenants(tenant_specs=(), tenants_file=None):
+    """Tenants from --tenant options and a file with one spec per line"""
+    specs = list(tenant_specs)
+    if tenants_file:
+        with open(tenants_file, 'r', encoding='utf-8') as f:
+            specs.extend(line for line in f if line.strip() and not line.startswith('#'))
     
-    for code, name, symbol in currencies:
-        cursor.execute("""
-            INSERT INTO currencies (id, code, name, symbol)
-            VALUES (UUID(), %s, %s, %s)
+    tenants = {}
+    for spec in specs or [TENANT_ID]:
+        tenant_id, user_id = parse_tenant(spec)
+        tenants.setdefault(tenant_id, user_id)
+    return list(tenants.items())
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def fetch_existing_names(cursor, table, tenant_ids):
+    """(company_id, name) pairs already present for the given tenants"""
+    existing = set()
+    for chunk in chunked(tenant_ids, TENANT_QUERY_CHUNK):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(f"SELECT company_id, name FROM {table} WHERE company_id IN ({placeholders})", chunk)
+        existing.update(cursor.fetchall())
+    return existing
+
+def insert_rows(cursor, table, columns, defaults, rows):
+    """Multi-row INSERT; returns the number of rows actually inserted"""
+    default_columns = [column for column, _ in defaults]
+    row_sql = '(UUID(), ' + ', '.join(['%s'] * len(columns) + [sql for _, sql in defaults]) + ')'
+    inserted = 0
+    for batch in chunked(rows, INSERT_BATCH_ROWS):
+        # The duplicate-key clause only guards against a concurrent seeder
+        cursor.execute(f"""
+            INSERT INTO {table} (id, {', '.join(list(columns) + default_columns)})
+            VALUES {', '.join([row_sql] * len(batch))}
             ON DUPLICATE KEY UPDATE name=name
-        """, (code, name, symbol))
-    
-    print(f"  ✅ Seeded {len(currencies)} currencies")
-
-def seed_regions(cursor):
-    """Seed regions"""
-    print("🗺️  Seeding regions...")
-    regions = [
-        ('NEW_CAIRO', 'New Cairo'),
-        ('KATAMEYA', 'Katameya'),
-        ('FIFTH_SETTLEMENT', '5th Settlement'),
-        ('WEST_GOLF', 'West Golf'),
-        ('HYDE_PARK', 'Hyde Park'),
-        ('MIVIDA', 'Mivida'),
-        ('UPTOWN_CAIRO', 'Uptown Cairo'),
-        ('STELLA_HEIGHTS', 'Stella Heights'),
-        ('MARASSI', 'Marassi'),
-        ('NORTH_COAST', 'North Coast'),
-        ('AIN_SOKHNA', 'Ain Sokhna'),
-        ('OCTOBER', '6th of October'),
-        ('MAADI', 'Maadi'),
-        ('HELIOPOLIS', 'Heliopolis'),
-        ('ZAMALEK', 'Zamalek'),
-        ('NASR_CITY', 'Nasr City'),
-        ('REHAB_CITY', 'Rehab City'),
-        ('SHOROUK', 'Shorouk'),
-        ('HELWAN', 'Helwan'),
-        ('TAGAMOA', 'Tagamoa'),
-        ('MOUNTAIN_VIEW', 'Mountain View'),
-        ('PALM_HILLS', 'Palm Hills'),
-        ('SODIC', 'Sodic'),
-        ('EMAAR', 'Emaar'),
-        ('COMPOUND_90', 'Compound 90'),
-        ('EASTOWN', 'Eastown'),
-        ('CAIRO_FESTIVAL_CITY', 'Cairo Festival City'),
-        ('ALLEGRIA', 'Allegria'),
-        ('ZAYED', 'Sheikh Zayed'),
-        ('DOWNTOWN', 'Downtown'),
-        ('GARDEN_CITY', 'Garden City'),
-        ('MOHANDESSIN', 'Mohandessin'),
-        ('DOKKI', 'Dokki'),
-        ('AGOUZA', 'Agouza'),
-        ('GIZA', 'Giza'),
-        ('SMART_VILLAGE', 'Smart Village'),
-        ('NEW_ZAYED', 'New Zayed')
-    ]
+        """, [value for row in batch for value in row])
+        inserted += cursor.rowcount
+    return inserted
+
+def seed_lookup_table(conn, spec, tenants):
+    """Insert the (tenant, value) pairs missing from one lookup table"""
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        existing = fetch_existing_names(cursor, spec['table'], [tenant_id for tenant_id, _ in tenants])
+        
+        tenant_columns = ('company_id', 'created_by_id') if spec['with_creator'] else ('company_id',)
+        missing = []
+        for tenant_id, user_id in tenants:
+            prefix = (tenant_id, user_id)[:len(tenant_columns)]
+            missing.extend(prefix + row for row in spec['rows'] if (tenant_id, row[0]) not in existing)
+        
+        inserted = insert_rows(cursor, spec['table'], tenant_columns + spec['columns'], spec['defaults'], missing)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
     
-    for code, name in regions:
-        cursor.execute("""
-            INSERT INTO regions (id, company_id, created_by_id, name, display_name, display_order, is_active)
-            VALUES (UUID(), %s, %s, %s, %s, 1, TRUE)
-            ON DUPLICATE KEY UPDATE name=name
-        """, (TENANT_ID, USER_ID, name, name))
+    elapsed = time.perf_counter() - started
+    print(f"{spec['label']}: {inserted} inserted, {len(existing)} already present ({elapsed:.2f}s)")
+    return {'inserted': inserted, 'existing': len(existing), 'seconds': elapsed}
+
+def seed_currencies(conn):
+    """Seed currencies (shared by all tenants)"""
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT code FROM currencies")
+        existing = {code for (code,) in cursor.fetchall()}
+        missing = [row for row in CURRENCIES if row[0] not in existing]
+        inserted = insert_rows(cursor, 'currencies', ('code', 'name', 'symbol'), (), missing)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
     
-    print(f"  ✅ Seeded {len(regions)} regions")
+    elapsed = time.perf_counter() - started
+    print(f"💰 currencies: {inserted} inserted, {len(existing)} already present ({elapsed:.2f}s)")
+    return {'inserted': inserted, 'existing': len(existing), 'seconds': elapsed}
 
-def main():
+def seed_tenants(conn, tenants):
+    """Seed every lookup table for a set of tenants; returns per-table results"""
+    results = {}
+    for spec in LOOKUP_TABLES:
+        results[spec['table']] = seed_lookup_table(conn, spec, tenants)
+    results['currencies'] = seed_currencies(conn)
+    return results
+
+def main(tenants=None):
     """Main seeding function"""
+    tenants = tenants or [(TENANT_ID, USER_ID)]
+    
     print("="*60)
     print("🌱 SEEDING LOOKUP TABLES")
     print("="*60)
-    print(f"Tenant: {TENANT_ID}")
-    print(f"User: {USER_ID}")
+    if len(tenants) == 1:
+        print(f"Tenant: {tenants[0][0]}")
+        print(f"User: {tenants[0][1]}")
+    else:
+        print(f"Tenants: {len(tenants)}")
     print("="*60)
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    conn = get_connection()
+    started = time.perf_counter()
     
     try:
-        seed_property_categories(cursor)
-        seed_property_types(cursor)
-        seed_property_statuses(cursor)
-        seed_finishing_statuses(cursor)
-        seed_currencies(cursor)
-        seed_regions(cursor)
-        
-        conn.commit()
+        results = seed_tenants(conn, tenants)
         
         print("\n" + "="*60)
         print("✅ SEEDING COMPLETED SUCCESSFULLY!")
+        print(f"Rows inserted: {sum(r['inserted'] for r in results.values())}")
+        print(f"Time: {time.perf_counter() - started:.2f}s")
         print("="*60)
-        
+    
     except Exception as e:
-        conn.rollback()
         print(f"\n❌ Error: {e}")
         raise
     
     finally:
-        cursor.close()
         conn.close()
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Seed lookup tables for one or more tenants')
+    parser.add_argument('--tenant', action='append', default=[], metavar='TENANT_ID[:USER_ID]',
+                        help=f'tenant to seed (repeatable; default user {USER_ID})')
+    parser.add_argument('--tenants-file', default=None,
+                        help='file with one TENANT_ID[:USER_ID] per line')
+    args = parser.parse_args()
+    
+    main(load_tenants(args.tenant, args.tenants_file))